@@ -0,0 +1,174 @@
+# -*- coding: utf8 -*-
+
+'''
+benchmark.py:
+
+Regression benchmark for the importer. Every file is parsed in its own
+process (so that the peak memory is measured per file) through ReadFile and
+the segment readers and - with '--build' - the FreeCAD model is created.
+FreeCAD itself is replaced by the stand-in modules of standInFreeCAD.py.
+
+Usage:
+	python benchmark.py [--build] [--verbose] [--output results.json] [file.ipt ...]
+If no files are given, all files in Demo-Status are used.
+The results are written as JSON (stdout or the output file).
+'''
+
+import sys
+import os
+import glob
+import json
+import shutil
+import tempfile
+import subprocess
+from timeit import default_timer
+
+try:
+	import resource
+except ImportError:
+	resource = None
+
+__author__      = 'Jens M. Plonka'
+__copyright__   = 'Copyright 2017, Germany'
+__version__     = '0.6.0'
+__status__      = 'In-Development'
+
+BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FOLDER    = os.path.dirname(BENCHMARK_FOLDER)
+
+def getPeakMemory():
+	'''
+	Returns the peak resident memory of this process in kB (None if not available).
+	'''
+	if (resource is None):
+		return None
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	if (sys.platform == 'darwin'):
+		rss = rss / 1024 # bytes on Mac OS X
+	return rss
+
+def countTreeNodes(node):
+	count = 1
+	for child in node.children:
+		count += countTreeNodes(child)
+	return count
+
+def getNodeCounts(model):
+	segments = {}
+	for name in model.RSeStorageData:
+		seg = model.RSeStorageData[name]
+		nodes = getattr(seg, 'elementNodes', None)
+		if (nodes):
+			tree = getattr(seg, 'tree', None)
+			branches = 0
+			if (tree is not None):
+				branches = countTreeNodes(tree) - 1
+			segments[name] = {'nodes': len(nodes), 'branches': branches, 'types': len(seg.sec4)}
+	return segments
+
+def addStage(result, name, start):
+	result['stages'][name] = {'time': default_timer() - start, 'peakMemory': getPeakMemory()}
+	return
+
+def runSingle(filename, build, verbose):
+	import standInFreeCAD
+	FreeCAD = standInFreeCAD.install(verbose)
+	sys.path.insert(0, SOURCE_FOLDER)
+
+	result = {'file': os.path.basename(filename), 'stages': {}}
+
+	folder = tempfile.mkdtemp(prefix='InventorLoader')
+	try:
+		infile = os.path.join(folder, os.path.basename(filename))
+		shutil.copyfile(filename, infile)
+
+		t0 = default_timer()
+		import Import_IPT
+		import importerProfiler
+		addStage(result, 'import', t0)
+
+		importerProfiler.setProfiling(True)
+		importerProfiler.resetProfiling()
+		Import_IPT.setInventorFile(infile)
+		doc = FreeCAD.newDocument(os.path.splitext(os.path.basename(filename))[0])
+
+		t0 = default_timer()
+		Import_IPT.ReadFile(doc, True)
+		addStage(result, 'ReadFile', t0)
+		result['version']  = Import_IPT.getFileVersion()
+		result['segments'] = getNodeCounts(Import_IPT.model)
+
+		if (build):
+			t0 = default_timer()
+			Import_IPT.create3dModel(None, doc)
+			addStage(result, 'create3dModel', t0)
+			result['objects']    = len(doc.Objects)
+			result['recomputes'] = doc.recomputes
+
+		result['profile'] = importerProfiler.getReport()
+	finally:
+		shutil.rmtree(folder, True)
+	return result
+
+def runAll(files, build, verbose):
+	results = []
+	for filename in files:
+		args = [sys.executable, os.path.abspath(__file__), '--single', filename]
+		if (build):   args.append('--build')
+		if (verbose): args.append('--verbose')
+		process = subprocess.Popen(args, stdout=subprocess.PIPE)
+		output, dummy = process.communicate()
+		if (process.returncode == 0):
+			results.append(json.loads(output.decode('utf8')))
+		else:
+			results.append({'file': os.path.basename(filename), 'error': process.returncode})
+	return {'version': __version__, 'python': sys.version.split()[0], 'results': results}
+
+def main(args):
+	build   = False
+	verbose = False
+	single  = False
+	output  = None
+	files   = []
+
+	i = 0
+	while (i < len(args)):
+		arg = args[i]
+		if (arg == '--build'):
+			build = True
+		elif (arg == '--verbose'):
+			verbose = True
+		elif (arg == '--single'):
+			single = True
+		elif (arg == '--output'):
+			i += 1
+			output = args[i]
+		else:
+			files.append(arg)
+		i += 1
+
+	if (single):
+		# keep stdout clean for the results - the importer prints debug output!
+		stdout = sys.stdout
+		sys.stdout = sys.stderr
+		try:
+			result = runSingle(files[0], build, verbose)
+		finally:
+			sys.stdout = stdout
+	else:
+		if (len(files) == 0):
+			files = sorted(glob.glob(os.path.join(SOURCE_FOLDER, 'Demo-Status', '*.ipt')))
+		result = runAll(files, build, verbose)
+
+	text = json.dumps(result, indent=1, sort_keys=True)
+	if (output):
+		file = open(output, 'w')
+		file.write(text)
+		file.close()
+	else:
+		sys.stdout.write(text)
+		sys.stdout.write('\n')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
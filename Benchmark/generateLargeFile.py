@@ -0,0 +1,416 @@
+# -*- coding: utf8 -*-
+
+'''
+generateLargeFile.py:
+
+Generates large synthetic Inventor part files for scaling benchmarks.
+The DC segment of a template file is parsed with the importer's parser (no
+FreeCAD required) to get the position of every node and of every node
+reference. Then the nodes (sketch entities, constraints, parameters,
+features, ...) are replicated N times: the references inside the copies are
+shifted to the copied nodes, the block sizes are appended to section 1 of the
+segment's M-stream and the copies are appended to the segment's B-stream.
+All other streams are copied unchanged into a new OLE2 compound file.
+
+Usage:
+	python generateLargeFile.py [--first index] [--last index] template.ipt count output.ipt
+
+The copies are not linked into the document's feature list, so they increase
+the amount of data to be parsed and built into trees, but not the number of
+objects created in FreeCAD.
+'''
+
+import sys
+import os
+import zlib
+import shutil
+import tempfile
+from struct import pack, unpack_from
+
+__author__      = 'Jens M. Plonka'
+__copyright__   = 'Copyright 2017, Germany'
+__version__     = '0.6.0'
+__status__      = 'In-Development'
+
+BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FOLDER    = os.path.dirname(BENCHMARK_FOLDER)
+
+SECTOR_SIZE      = 512
+MINI_SECTOR_SIZE = 64
+MINI_CUTOFF      = 4096
+FREESECT         = 0xFFFFFFFF
+ENDOFCHAIN       = 0xFFFFFFFE
+FATSECT          = 0xFFFFFFFD
+DIFSECT          = 0xFFFFFFFC
+NOSTREAM         = 0xFFFFFFFF
+
+STGTY_STORAGE    = 1
+STGTY_STREAM     = 2
+STGTY_ROOT       = 5
+
+class OleEntry():
+	def __init__(self, name, type, clsid = None, data = None):
+		self.name     = name
+		self.type     = type
+		self.clsid    = clsid
+		self.data     = data
+		self.children = []
+		self.sid      = NOSTREAM
+		self.start    = ENDOFCHAIN
+
+	def getSortKey(self):
+		return (len(self.name), self.name.upper())
+
+def readOleTree(ole):
+	'''
+	Returns the OleEntry tree of all storages and streams of an OleFileIO instance.
+	'''
+	def readEntry(direntry, path):
+		name = direntry.name
+		if (not isinstance(name, type(u''))):
+			name = name.decode('utf8')
+		if (direntry.entry_type == STGTY_STREAM):
+			return OleEntry(name, STGTY_STREAM, direntry.clsid, ole.openstream(path + [direntry.name]).read())
+		entry = OleEntry(name, direntry.entry_type, direntry.clsid)
+		for kid in direntry.kids:
+			if (direntry.entry_type == STGTY_ROOT):
+				entry.children.append(readEntry(kid, []))
+			else:
+				entry.children.append(readEntry(kid, path + [direntry.name]))
+		return entry
+	return readEntry(ole.root, [])
+
+def findOleEntry(root, path):
+	entry = root
+	for name in path:
+		found = None
+		for child in entry.children:
+			if (child.name == name):
+				found = child
+		if (found is None):
+			return None
+		entry = found
+	return entry
+
+def _getClsid(clsid):
+	if (clsid):
+		h = clsid.replace('-', '')
+		b = bytearray.fromhex(h)
+		# stored as little endian GUID
+		return bytes(bytearray([b[3], b[2], b[1], b[0], b[5], b[4], b[7], b[6]]) + b[8:16])
+	return b'\x00' * 16
+
+def _chain(fat, start, count):
+	i = 0
+	while (i < count):
+		if (i + 1 < count):
+			fat[start + i] = start + i + 1
+		else:
+			fat[start + i] = ENDOFCHAIN
+		i += 1
+	return
+
+def _sectors(size, sectorSize):
+	return (size + sectorSize - 1) // sectorSize
+
+def _pad(data, sectorSize):
+	rest = len(data) % sectorSize
+	if (rest):
+		return data + b'\x00' * (sectorSize - rest)
+	return data
+
+def writeOleFile(filename, root):
+	'''
+	Writes the OleEntry tree as OLE2 compound file (version 3, 512 bytes sectors).
+	'''
+	entries = []
+	def collect(entry):
+		entry.sid = len(entries)
+		entries.append(entry)
+		entry.children.sort(key=OleEntry.getSortKey)
+		for child in entry.children:
+			collect(child)
+	collect(root)
+
+	# small streams go into the mini stream
+	miniStream = b''
+	miniFat    = []
+	for entry in entries:
+		if ((entry.type == STGTY_STREAM) and (0 < len(entry.data) < MINI_CUTOFF)):
+			entry.start = len(miniStream) // MINI_SECTOR_SIZE
+			count = _sectors(len(entry.data), MINI_SECTOR_SIZE)
+			miniFat.extend([FREESECT] * count)
+			_chain(miniFat, entry.start, count)
+			miniStream += _pad(entry.data, MINI_SECTOR_SIZE)
+
+	sectors = []
+	fat     = {}
+	def allocate(data):
+		if (len(data) == 0):
+			return ENDOFCHAIN
+		start = len(sectors)
+		data = _pad(data, SECTOR_SIZE)
+		i = 0
+		while (i < len(data)):
+			sectors.append(data[i:i + SECTOR_SIZE])
+			i += SECTOR_SIZE
+		_chain(fat, start, len(sectors) - start)
+		return start
+
+	for entry in entries:
+		if ((entry.type == STGTY_STREAM) and (len(entry.data) >= MINI_CUTOFF)):
+			entry.start = allocate(entry.data)
+	root.start     = allocate(miniStream)
+	miniFatStart   = allocate(b''.join([pack('<I', s) for s in miniFat]))
+	miniFatSectors = _sectors(len(miniFat) * 4, SECTOR_SIZE)
+
+	# the directory: siblings are stored as a degenerated (but sorted) binary tree
+	directory = b''
+	for entry in entries:
+		name = entry.name.encode('UTF-16LE')
+		child = NOSTREAM
+		right = NOSTREAM
+		if (len(entry.children) > 0):
+			child = entry.children[0].sid
+			i = 0
+			while (i < len(entry.children) - 1):
+				entry.children[i].right = entry.children[i + 1].sid
+				i += 1
+		right = getattr(entry, 'right', NOSTREAM)
+		size = 0
+		start = 0
+		if (entry.type == STGTY_STREAM):
+			size = len(entry.data)
+			start = entry.start
+		elif (entry.type == STGTY_ROOT):
+			size = len(miniStream)
+			start = entry.start
+		directory += name + b'\x00' * (64 - len(name))
+		directory += pack('<HBBIII', len(name) + 2, entry.type, 1, NOSTREAM, right, child)
+		directory += _getClsid(entry.clsid)
+		directory += pack('<IQQIII', 0, 0, 0, start, size, 0)
+	directory += (b'\x00' * 64 + pack('<HBBIII', 0, 0, 0, NOSTREAM, NOSTREAM, NOSTREAM) + b'\x00' * 52) * ((4 - len(entries) % 4) % 4)
+	directoryStart = allocate(directory)
+
+	# FAT and DIFAT sectors must be accounted in the FAT itself
+	dataSectors = len(sectors)
+	fatSectors   = 0
+	difatSectors = 0
+	while (True):
+		total = dataSectors + fatSectors + difatSectors
+		neededFat = _sectors(total, SECTOR_SIZE // 4)
+		neededDifat = 0
+		if (neededFat > 109):
+			neededDifat = _sectors(neededFat - 109, SECTOR_SIZE // 4 - 1)
+		if ((neededFat == fatSectors) and (neededDifat == difatSectors)):
+			break
+		fatSectors   = neededFat
+		difatSectors = neededDifat
+
+	fatStart   = dataSectors
+	difatStart = fatStart + fatSectors
+	i = 0
+	while (i < fatSectors):
+		fat[fatStart + i] = FATSECT
+		i += 1
+	i = 0
+	while (i < difatSectors):
+		fat[difatStart + i] = DIFSECT
+		i += 1
+
+	fatData = b''.join([pack('<I', fat.get(i, FREESECT)) for i in range(fatSectors * SECTOR_SIZE // 4)])
+	fatLocations = range(fatStart, fatStart + fatSectors)
+
+	difatData = b''
+	i = 0
+	while (i < difatSectors):
+		locations = list(fatLocations[109 + i * 127: 109 + (i + 1) * 127])
+		locations += [FREESECT] * (127 - len(locations))
+		if (i + 1 < difatSectors):
+			locations.append(difatStart + i + 1)
+		else:
+			locations.append(ENDOFCHAIN)
+		difatData += b''.join([pack('<I', l) for l in locations])
+		i += 1
+
+	header  = b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1' + b'\x00' * 16
+	header += pack('<HHHHH', 0x003E, 0x0003, 0xFFFE, 9, 6)
+	header += b'\x00' * 6
+	header += pack('<IIIIIIIII', 0, fatSectors, directoryStart, 0, MINI_CUTOFF, IFF(len(miniFat) > 0, miniFatStart, ENDOFCHAIN), miniFatSectors, IFF(difatSectors > 0, difatStart, ENDOFCHAIN), difatSectors)
+	difat = list(fatLocations[0:109]) + [FREESECT] * (109 - min(109, fatSectors))
+	header += b''.join([pack('<I', l) for l in difat])
+
+	file = open(filename, 'wb')
+	file.write(header)
+	for sector in sectors:
+		file.write(sector)
+	file.write(fatData)
+	file.write(difatData)
+	file.close()
+	return
+
+def IFF(expression, valueTrue, valueFalse):
+	if (expression):
+		return valueTrue
+	return valueFalse
+
+def getLen32Size(data, offset, width):
+	l, = unpack_from('<I', data, offset)
+	return offset + 4 + l * width
+
+def getMetaDataHeaderSize(dataM):
+	'''
+	Returns the offset of the compressed data in the M-stream - see ReadRSeMetaDataM.
+	'''
+	i = getLen32Size(dataM, 0, 1)             # txt1
+	ver, = unpack_from('<H', dataM, i)
+	i += 2 + 16                               # ver, arr1
+	i = getLen32Size(dataM, i, 2)             # name
+	i += 16 + 12                              # segRef, arr2
+	if (ver < 0x07):
+		i += 4
+		i = getLen32Size(dataM, i, 1)
+		i += 4
+		i = getLen32Size(dataM, i, 1)
+	else:
+		i = getLen32Size(dataM, i, 1)
+		i = getLen32Size(dataM, i, 1)
+	return i + 1                              # the '\x01'
+
+def getMetaDataName(dataM):
+	i = getLen32Size(dataM, 0, 1) + 2 + 16
+	l, = unpack_from('<I', dataM, i)
+	name = dataM[i + 4: i + 4 + 2 * l].decode('UTF-16LE')
+	if (name[-1:] == u'\x00'): name = name[:-1]
+	if (name[-1:] == u'\n'):   name = name[:-1]
+	return name
+
+def parseTemplate(template):
+	'''
+	Parses the template with the importer and returns the DC segment.
+	'''
+	sys.path.insert(0, SOURCE_FOLDER)
+	stdout = sys.stdout
+	sys.stdout = sys.stderr
+	folder = tempfile.mkdtemp(prefix='InventorLoader')
+	try:
+		import importerParser
+		from importerClasses import RSeMetaData
+		from importerUtils   import getFileVersion
+		infile = os.path.join(folder, os.path.basename(template))
+		shutil.copyfile(template, infile)
+		importerParser.setInventorFile(infile)
+		importerParser.ReadFile(None, False)
+		for name in importerParser.model.RSeStorageData:
+			seg = importerParser.model.RSeStorageData[name]
+			if (RSeMetaData.isDC(seg)):
+				return seg, getFileVersion()
+	finally:
+		sys.stdout = stdout
+		shutil.rmtree(folder, True)
+	return None, None
+
+def shiftRef(data, offset, first, last, shift):
+	n, m = unpack_from('<HH', data, offset)
+	index = n + ((m & 0x7FFF) << 16)
+	if ((index >= first) and (index <= last)):
+		index += shift
+		data[offset:offset + 4] = pack('<HH', index & 0xFFFF, (m & 0x8000) | ((index >> 16) & 0x7FFF))
+	return
+
+def replicateNodes(seg, buffer, hdrSize, count, first, last):
+	'''
+	Returns the block sizes and the data of the replicated nodes.
+	'''
+	nodes  = seg.elementNodes
+	total  = len(nodes)
+	sizes  = []
+	blocks = []
+	sep    = b'\x00' * (hdrSize - 4)
+	copy = 1
+	while (copy < count):
+		shift = total + (copy - 1) * (last - first + 1) - first + 1
+		index = first
+		while (index <= last):
+			node = nodes[index]
+			block = bytearray(buffer[node.offset - 4: node.offset + node.size + 4])
+			refs = list(node.childIndexes)
+			if (node.parentIndex is not None): refs.append(node.parentIndex)
+			offsets = set([ref.offset for ref in refs if (ref.offset >= 0)])
+			for offset in offsets:
+				shiftRef(block, offset + 4, first, last, shift)
+			blocks.append(sep)
+			blocks.append(bytes(block))
+			sizes.append(node.size)
+			index += 1
+		copy += 1
+	return sizes, b''.join(blocks)
+
+def generate(template, count, output, first = None, last = None):
+	from olefile import OleFileIO
+
+	seg, version = parseTemplate(template)
+	if (seg is None):
+		raise ValueError("Template '%s' has no DC segment!" %(template))
+	if (first is None): first = 1
+	if (last is None):  last = len(seg.elementNodes)
+	hdrSize = IFF(version < 2015, 4, 5)
+
+	ole = OleFileIO(template)
+	root = readOleTree(ole)
+	ole.close()
+
+	storage = findOleEntry(root, [u'RSeStorage'])
+	streamM = None
+	streamB = None
+	for entry in storage.children:
+		if (entry.name.startswith(u'M') and (getMetaDataName(entry.data) == seg.name)):
+			streamM = entry
+			streamB = findOleEntry(storage, [u'B' + entry.name[1:]])
+	if ((streamM is None) or (streamB is None)):
+		raise ValueError("Can't find M- and B-stream of segment '%s'!" %(seg.name))
+
+	# B-stream: UUID, UInt16, compressed blocks
+	buffer = zlib.decompressobj().decompress(streamB.data[18:])
+	lastNode = seg.elementNodes[len(seg.elementNodes)]
+	end = lastNode.offset + lastNode.size + 4
+	sizes, blocks = replicateNodes(seg, buffer, hdrSize, count, first, last)
+	streamB.data = streamB.data[0:18] + zlib.compress(buffer[0:end] + blocks + buffer[end:])
+
+	# M-stream: section 1 contains the sizes of all blocks
+	i = getMetaDataHeaderSize(streamM.data)
+	data = zlib.decompressobj().decompress(streamM.data[i:])
+	cnt, = unpack_from('<I', data, 14)
+	end = 18 + cnt * 4
+	sec1 = data[18:end] + b''.join([pack('<I', size | 0x80000000) for size in sizes])
+	cnt += len(sizes)
+	data = data[0:14] + pack('<I', cnt) + sec1 + pack('<I', cnt * 4 + 4) + data[end + 4:]
+	streamM.data = streamM.data[0:i] + zlib.compress(data)
+
+	writeOleFile(output, root)
+	return len(seg.elementNodes) + len(sizes)
+
+def main(args):
+	first = None
+	last  = None
+	files = []
+	i = 0
+	while (i < len(args)):
+		if (args[i] == '--first'):
+			i += 1
+			first = int(args[i], 0)
+		elif (args[i] == '--last'):
+			i += 1
+			last = int(args[i], 0)
+		else:
+			files.append(args[i])
+		i += 1
+	if (len(files) != 3):
+		sys.stderr.write(__doc__)
+		return 1
+	nodes = generate(files[0], int(files[1]), files[2], first, last)
+	sys.stdout.write('%s: %d nodes in DC segment\n' %(files[2], nodes))
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
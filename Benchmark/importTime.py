@@ -0,0 +1,120 @@
+# -*- coding: utf8 -*-
+
+'''
+importTime.py:
+
+Startup benchmark for the importer: measures the time to import Import_IPT in
+a fresh process and checks that the heavy modules (the segment readers, the
+FreeCAD builder and the Excel packages) are not loaded before they are used.
+FreeCAD itself is replaced by the stand-in modules of standInFreeCAD.py.
+On python 3.7+ the child process runs with '-X importtime' and the report of
+the importer's modules is added to the results.
+
+Usage:
+	python importTime.py [--output results.json]
+Returns 1 if a heavy module is loaded on startup.
+'''
+
+import sys
+import os
+import json
+import subprocess
+from timeit import default_timer
+
+__author__      = 'Jens M. Plonka'
+__copyright__   = 'Copyright 2017, Germany'
+__version__     = '0.6.0'
+__status__      = 'In-Development'
+
+BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+SOURCE_FOLDER    = os.path.dirname(BENCHMARK_FOLDER)
+
+# Modules that must only be loaded on first use.
+LAZY_MODULES = ['importerDC', 'importerApp', 'importerBRep', 'importerBrowser', 'importerDesignView', 'importerEeData', 'importerEeScene', 'importerFBAttribute', 'importerGraphics', 'importerNotebook', 'importerResults', 'importerFreeCAD', 'xlrd', 'xlwt', 'xlutils']
+
+def runSingle(verbose):
+	import standInFreeCAD
+	standInFreeCAD.install(verbose)
+	sys.path.insert(0, SOURCE_FOLDER)
+
+	t0 = default_timer()
+	import Import_IPT
+	result = {'time': default_timer() - t0, 'loaded': []}
+	for name in LAZY_MODULES:
+		if (name in sys.modules):
+			result['loaded'].append(name)
+	return result
+
+def getImportTimes(text):
+	'''
+	Returns the cumulative import times [us] of the importer's modules from the
+	'-X importtime' report.
+	'''
+	times = {}
+	for line in text.splitlines():
+		if (line.startswith('import time:')):
+			columns = line[12:].split('|')
+			if (len(columns) == 3):
+				name = columns[2].strip()
+				if (name.startswith('importer') or (name == 'Import_IPT')):
+					times[name] = int(columns[1])
+	return times
+
+def runAll(verbose):
+	args = [sys.executable]
+	if (sys.version_info >= (3, 7)):
+		args += ['-X', 'importtime']
+	args += [os.path.abspath(__file__), '--single']
+	if (verbose): args.append('--verbose')
+	process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+	output, errors = process.communicate()
+	if (process.returncode != 0):
+		return {'error': process.returncode, 'stderr': errors.decode('utf8')}
+	result = json.loads(output.decode('utf8'))
+	if (sys.version_info >= (3, 7)):
+		result['importtime'] = getImportTimes(errors.decode('utf8'))
+	result['python'] = sys.version.split()[0]
+	return result
+
+def main(args):
+	verbose = False
+	single  = False
+	output  = None
+
+	i = 0
+	while (i < len(args)):
+		arg = args[i]
+		if (arg == '--verbose'):
+			verbose = True
+		elif (arg == '--single'):
+			single = True
+		elif (arg == '--output'):
+			i += 1
+			output = args[i]
+		i += 1
+
+	if (single):
+		# keep stdout clean for the results!
+		stdout = sys.stdout
+		sys.stdout = sys.stderr
+		try:
+			result = runSingle(verbose)
+		finally:
+			sys.stdout = stdout
+	else:
+		result = runAll(verbose)
+
+	text = json.dumps(result, indent=1, sort_keys=True)
+	if (output):
+		file = open(output, 'w')
+		file.write(text)
+		file.close()
+	else:
+		sys.stdout.write(text)
+		sys.stdout.write('\n')
+	if ((len(result.get('loaded', [])) > 0) or ('error' in result)):
+		return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
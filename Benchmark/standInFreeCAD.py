@@ -0,0 +1,276 @@
+# -*- coding: utf8 -*-
+
+'''
+standInFreeCAD.py:
+
+Lightweight stand-in for the FreeCAD, FreeCADGui, Part, Sketcher and Draft
+modules. It allows to run the parser and the model building of the importer
+on machines without FreeCAD (e.g. CI servers). The objects only record what
+is done with them - no geometry will be calculated!
+'''
+
+import sys
+import types
+
+__author__      = 'Jens M. Plonka'
+__copyright__   = 'Copyright 2017, Germany'
+__version__     = '0.6.0'
+__status__      = 'In-Development'
+
+_verbose = False
+
+class StandIn(object):
+	'''
+	Accepts every attribute access, call, index and arithmetic operation.
+	'''
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def __getattr__(self, name):
+		if (name.startswith('__')):
+			raise AttributeError(name)
+		value = StandIn()
+		object.__setattr__(self, name, value)
+		return value
+
+	def __call__(self, *args, **kwargs): return StandIn()
+	def __getitem__(self, key):          return StandIn()
+	def __setitem__(self, key, value):   return
+	def __iter__(self):                  return iter([])
+	def __len__(self):                   return 0
+	def __nonzero__(self):               return True
+	def __bool__(self):                  return True
+	def __float__(self):                 return 0.0
+	def __int__(self):                   return 0
+	def __neg__(self):                   return self
+	def __add__(self, other):            return self
+	def __sub__(self, other):            return self
+	def __mul__(self, other):            return self
+	def __div__(self, other):            return self
+	def __truediv__(self, other):        return self
+	__radd__ = __add__
+	__rsub__ = __sub__
+	__rmul__ = __mul__
+	__rdiv__ = __div__
+	__rtruediv__ = __truediv__
+
+class Vector(StandIn):
+	def __init__(self, x = 0.0, y = 0.0, z = 0.0):
+		if (isinstance(x, Vector)):
+			x, y, z = x.x, x.y, x.z
+		self.x = float(x)
+		self.y = float(y)
+		self.z = float(z)
+
+	def __add__(self, other): return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+	def __sub__(self, other): return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+	def __mul__(self, f):
+		if (isinstance(f, Vector)): return self.x * f.x + self.y * f.y + self.z * f.z
+		return Vector(self.x * f, self.y * f, self.z * f)
+	def __neg__(self):        return Vector(-self.x, -self.y, -self.z)
+	def __iter__(self):       return iter([self.x, self.y, self.z])
+	def __len__(self):        return 3
+	def __getitem__(self, i): return [self.x, self.y, self.z][i]
+	__rmul__ = __mul__
+
+	def negative(self):         return -self
+	def normalize(self):        return self
+	def multiply(self, f):      return self * f
+	def cross(self, other):     return Vector(self.y * other.z - self.z * other.y, self.z * other.x - self.x * other.z, self.x * other.y - self.y * other.x)
+	def getAngle(self, other):  return 0.0
+	def distanceToPoint(self, other):
+		d = self - other
+		return (d * d) ** 0.5
+	def distanceToLine(self, base, dir): return 0.0
+	def projectToLine(self, base, dir):  return self
+
+class Matrix(StandIn):
+	def __init__(self, *args):
+		values = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+		if (len(args) == 16):
+			values = [float(a) for a in args]
+		r = 1
+		while (r <= 4):
+			c = 1
+			while (c <= 4):
+				setattr(self, 'A%d%d' %(r, c), values[(r - 1) * 4 + c - 1])
+				c += 1
+			r += 1
+
+	def multiply(self, v):
+		if (isinstance(v, Vector)):
+			return Vector(self.A11 * v.x + self.A12 * v.y + self.A13 * v.z + self.A14, self.A21 * v.x + self.A22 * v.y + self.A23 * v.z + self.A24, self.A31 * v.x + self.A32 * v.y + self.A33 * v.z + self.A34)
+		return self
+
+class Placement(StandIn):
+	def __init__(self, *args):
+		self.Base = Vector()
+		self.Rotation = Rotation()
+		if ((len(args) > 0) and isinstance(args[0], Vector)):
+			self.Base = Vector(args[0])
+		elif ((len(args) > 0) and isinstance(args[0], Matrix)):
+			self.Base = Vector(args[0].A14, args[0].A24, args[0].A34)
+		elif ((len(args) > 0) and isinstance(args[0], Placement)):
+			self.Base = Vector(args[0].Base)
+			self.Rotation = args[0].Rotation
+
+	def toMatrix(self):
+		m = Matrix()
+		m.A14, m.A24, m.A34 = self.Base.x, self.Base.y, self.Base.z
+		return m
+
+	def multiply(self, other): return self
+
+class Rotation(StandIn):
+	def multVec(self, v): return v
+
+class ParameterGroup(object):
+	def __init__(self):
+		self._values = {}
+	def GetBool(self, name, default = False):   return self._values.get(name, default)
+	def SetBool(self, name, value):             self._values[name] = value
+	def GetInt(self, name, default = 0):        return self._values.get(name, default)
+	def SetInt(self, name, value):              self._values[name] = value
+	def GetString(self, name, default = ''):    return self._values.get(name, default)
+	def SetString(self, name, value):           self._values[name] = value
+	def GetFloat(self, name, default = 0.0):    return self._values.get(name, default)
+	def SetFloat(self, name, value):            self._values[name] = value
+
+def _print(msg):
+	if (_verbose):
+		if (isinstance(msg, unicode)):
+			msg = msg.encode('utf8')
+		sys.stderr.write(msg)
+	return
+
+class Console(object):
+	@staticmethod
+	def PrintMessage(msg): _print(msg)
+	@staticmethod
+	def PrintWarning(msg): _print(msg)
+	@staticmethod
+	def PrintError(msg):   _print(msg)
+
+class DocumentObject(StandIn):
+	def __init__(self, doc, typeId, name):
+		self.Document = doc
+		self.TypeId = typeId
+		self.Name = name
+		self.Label = name
+		self.Placement = Placement()
+		self.Geometry = []
+		self.Constraints = []
+
+	def isDerivedFrom(self, typeId):
+		return self.TypeId == typeId
+
+	def addGeometry(self, geometry, construction = False):
+		if (isinstance(geometry, list)):
+			index = len(self.Geometry)
+			self.Geometry.extend(geometry)
+			return range(index, len(self.Geometry))
+		self.Geometry.append(geometry)
+		return len(self.Geometry) - 1
+
+	def addConstraint(self, constraint):
+		if (isinstance(constraint, list)):
+			index = len(self.Constraints)
+			self.Constraints.extend(constraint)
+			return range(index, len(self.Constraints))
+		self.Constraints.append(constraint)
+		return len(self.Constraints) - 1
+
+	@property
+	def ConstraintCount(self):
+		return len(self.Constraints)
+
+	def getPoint(self, index, pos):
+		return Vector()
+
+	def solve(self):
+		return 0
+
+	def addObject(self, obj):
+		return
+
+class Document(StandIn):
+	def __init__(self, name):
+		self.Name = name
+		self.Label = name
+		self.Comment = ''
+		self.CreatedBy = ''
+		self.LastModifiedBy = ''
+		self.Company = ''
+		self.Objects = []
+		self.recomputes = 0
+
+	def addObject(self, typeId, name):
+		obj = DocumentObject(self, typeId, name)
+		self.Objects.append(obj)
+		return obj
+
+	def getObject(self, name):
+		for obj in self.Objects:
+			if (obj.Name == name): return obj
+		return None
+
+	def recompute(self):
+		self.recomputes += 1
+
+_documents = {}
+_parameters = {}
+
+def newDocument(name):
+	doc = Document(name)
+	_documents[name] = doc
+	return doc
+
+def getDocument(name):
+	return _documents[name]
+
+def ParamGet(path):
+	if (path not in _parameters):
+		_parameters[path] = ParameterGroup()
+	return _parameters[path]
+
+def _newModule(name):
+	module = types.ModuleType(name)
+	sys.modules[name] = module
+	return module
+
+def install(verbose = False):
+	'''
+	Registers the stand-in modules, so that 'import FreeCAD' etc. will use them.
+	'''
+	global _verbose
+	_verbose = verbose
+
+	fc = _newModule('FreeCAD')
+	fc.GuiUp          = False
+	fc.Vector         = Vector
+	fc.Matrix         = Matrix
+	fc.Placement      = Placement
+	fc.Rotation       = Rotation
+	fc.Console        = Console
+	fc.ParamGet       = ParamGet
+	fc.newDocument    = newDocument
+	fc.getDocument    = getDocument
+	fc.addImportType  = lambda *args: None
+	fc.getHomePath    = lambda: ''
+	fc.ActiveDocument = None
+
+	gui = _newModule('FreeCADGui')
+	gui.getDocument          = lambda name: StandIn()
+	gui.SendMsgToActiveView  = lambda *args: None
+
+	part = _newModule('Part')
+	for name in ['Point', 'Line', 'LineSegment', 'Circle', 'ArcOfCircle', 'Ellipse', 'ArcOfEllipse', 'BSplineCurve', 'Face', 'Wire', 'Shape', 'Compound', 'makeCompound']:
+		setattr(part, name, StandIn)
+
+	sketcher = _newModule('Sketcher')
+	sketcher.Constraint = StandIn
+
+	draft = _newModule('Draft')
+	draft.makeArray = lambda baseobject, *args: baseobject.Document.addObject('Part::FeaturePython', args[-1])
+
+	return fc
@@ -35,24 +35,27 @@ def missingDependency(module, url, folder):
 	FreeCAD.Console.PrintWarning("DONE!\n")
 	setCanImport(False)
 
-try:
-	import xlwt
-except:
+def isModuleAvailable(module):
+	'''
+	Checks if the module can be imported - without importing (loading) it.
+	'''
+	import imp
+	try:
+		imp.find_module(module)
+		return True
+	except ImportError:
+		return False
+
+if (not isModuleAvailable('xlwt')):
 	missingDependency("xlrd", "https://pypi.python.org/pypi/xlwt", "xlwt-1.3.0")
 
-try:
-	import xlrd
-except:
+if (not isModuleAvailable('xlrd')):
 	missingDependency("xlrd", "https://pypi.python.org/pypi/xlrd", "xlrd-1.1.0")
 
-try:
-	import xlutils
-except:
+if (not isModuleAvailable('xlutils')):
 	missingDependency("xlutils", "http://pypi.python.org/pypi/xlutils", "xlutils-2.0.0")
 
-try:
-	import olefile
-except:
+if (not isModuleAvailable('olefile')):
 	missingDependency("olefile", "http://www.decalage.info/python/olefileio", "olefile")
 
 if (not canImport()):
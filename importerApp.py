@@ -8,7 +8,7 @@ The importer can read files from Autodesk (R) Invetor (R) Inventro V2010 on. Old
 TODO:
 '''
 
-from importerSegment import SegmentReader, getNodeType
+from importerSegment import SegmentReader, getBlockType
 from importerSegNode import AbstractNode, AppNode
 from importerUtils   import *
 
@@ -699,18 +699,16 @@ class AppReader(SegmentReader):
 	def setNodeData(self, node, data):
 		offset = node.offset
 		nodeTypeID, i = getUInt8(data, offset - 4)
-		node.typeID = getNodeType(nodeTypeID, node.segment)
-		if (isinstance(node.typeID, UUID)):
-			node.typeName = '%08X' % (node.typeID.time_low)
-			i = offset + node.size
+		node.blockType = getBlockType(nodeTypeID, node.segment)
+		node.typeID    = node.blockType.typeID
+		node.typeName  = node.blockType.name
+		i = offset + node.size
+		s, dummy = getUInt32(data, i)
+		if ((s != node.size) and (node.blockType.key == 0xF8A779F9)):
 			s, dummy = getUInt32(data, i)
-			if ((s != node.size) and (node.typeID.time_low == 0xF8A779F9)):
+			while ((s != node.size) and (i < len(data))):
+				i += 1
 				s, dummy = getUInt32(data, i)
-				while ((s != node.size) and (i < len(data))):
-					i += 1
-					s, dummy = getUInt32(data, i)
-				node.size = i - offset
-		else:
-			node.typeName = '%08X' % (node.typeID)
+			node.size = i - offset
 
 		node.data = data[offset:offset + node.size]
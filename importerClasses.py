@@ -6,7 +6,7 @@ importerClasses.py:
 Collection of classes necessary to read and analyse Autodesk (R) Invetor (R) files.
 '''
 
-from importerUtils import IntArr2Str, FloatArr2Str, logMessage, logWarning, logError, getInventorFile, getUInt16, getUInt16A, getFileVersion
+from importerUtils import IntArr2Str, FloatArr2Str, logMessage, logWarning, logError, getInventorFile, getUInt16, getUInt16A, getFileVersion, getUUIDName
 from math          import degrees, radians, pi
 
 __author__      = 'Jens M. Plonka'
@@ -14,20 +14,25 @@ __copyright__   = 'Copyright 2017, Germany'
 __version__     = '0.6.0'
 __status__      = 'In-Development'
 
+def getThumbnail(data):
+	thmb = Thumbnail()
+	thmb.width, i = getUInt16(data, 10)
+	thmb.height, i = getUInt16(data, i)
+	# skip thumbnail class header (-1, -1, 03, 00, 08, width, height, 00)
+	thmb.data = data[0x10:]
+	return thmb
+
 def writeThumbnail(data):
 	folder = getInventorFile()[0:-4]
+	thmb = getThumbnail(data)
 	filename = folder + '/_.png'
 	with open(filename, 'wb') as thumbnail:
-		# skip thumbnail class header (-1, -1, 03, 00, 08, width, height, 00)
-		thumbnail.write(data[0x10:])
+		thumbnail.write(thmb.data)
 	filename = folder + '/_.log'
 	with open(filename, 'wb') as thumbnail:
 		# skip thumbnail class header (-1, -1, 03, 00, 08, width, height, 00)
 		arr, i = getUInt16A(data, 0, 8)
 		thumbnail.write(IntArr2Str(arr, 2))
-	thmb = Thumbnail()
-	thmb.width, i = getUInt16(data, 10)
-	thmb.height, i = getUInt16(data, i)
 	return thmb
 
 class UFRxDocument():
@@ -174,13 +179,20 @@ class RSeStorageSection4Data():
 		return '(%04X,%08X)' %(self.num, self.val)
 
 class RSeStorageBlockType():
+	'''
+	The type of the blocks (nodes) of a segment. There is only one instance per
+	type and segment that is shared by all nodes of this type.
+	'''
 	def __init__(self, parent):
 		self.parent      = parent
 		self.typeID      = None
+		self.key         = 0       # UInt32 - typeID.time_low
+		self.name        = ''      # '%08X' of the key
+		self.reader      = None    # the reader's Read_<name> method
 		self.arr         = []      # RSeStorageSection4Data[2]
 
 	def __str__(self):
-		return '%s: [%s,%s]' %(self.typeID, self.arr[0], self.arr[1])
+		return '%s: [%s,%s]' %(getUUIDName(self.typeID, self.typeID), self.arr[0], self.arr[1])
 
 class RSeStorageSection4Data1():
 	def __init__(self, uid, val):
@@ -260,6 +272,46 @@ class RSeStorageSectionB():
 	def __str__(self):
 		return '[%s]' %(IntArr2Str(self.arr, 4))
 
+class RSeRecordArray():
+	'''
+	List of the fixed size records of a RSeMetaData section.
+	The records are stored column by column (see getRecordColumns). The
+	RSeStorage* object of a record is created by create(parent, columns, index)
+	when it's accessed for the first time.
+	'''
+	def __init__(self, parent, columns, create):
+		self.parent      = parent
+		self.columns     = columns
+		self.create      = create
+		self.records     = {}
+
+	def getColumn(self, field):
+		if (len(self.columns) == 0):
+			return ()
+		return self.columns[field]
+
+	def __len__(self):
+		return len(self.getColumn(0))
+
+	def __getitem__(self, index):
+		count = len(self)
+		if (index < 0):
+			index += count
+		if ((index < 0) or (index >= count)):
+			raise IndexError('record index %d out of range' %(index))
+		record = self.records.get(index)
+		if (record is None):
+			record = self.create(self.parent, self.columns, index)
+			self.records[index] = record
+		return record
+
+	def __iter__(self):
+		index = 0
+		count = len(self)
+		while (index < count):
+			yield self[index]
+			index += 1
+
 class RSeMetaData():
 	AM_APP       = 'AmAppSegment'
 	PM_APP       = 'PmAppSegment'
@@ -300,17 +352,17 @@ class RSeMetaData():
 		self.arr2        = []
 		self.segRef      = None
 		self.arr3        = []
-		self.sec1        = []
-		self.sec2        = []
-		self.sec3        = []
-		self.sec4        = {}
+		self.sec1        = RSeRecordArray(self, [], None)
+		self.sec2        = RSeRecordArray(self, [], None)
+		self.sec3        = RSeRecordArray(self, [], None)
+		self.sec4        = RSeRecordArray(self, [], None)
 		self.sec5        = []
 		self.sec6        = []
 		self.sec7        = []
-		self.sec8        = []
-		self.sec9        = []
-		self.secA        = []
-		self.secB        = []
+		self.sec8        = RSeRecordArray(self, [], None)
+		self.sec9        = RSeRecordArray(self, [], None)
+		self.secA        = RSeRecordArray(self, [], None)
+		self.secB        = RSeRecordArray(self, [], None)
 		self.uid2        = None # should always be '9744e6a4-11d1-8dd8-0008-2998bedddc09'
 		self.nodes       = None
 		self.elementNodes = {}
@@ -391,7 +443,7 @@ class DbInterface():
 		elif (self.type == 0x54): typ = 'MAP'
 		else:
 			typ = '%4X' % self.type
-		return '%s=%s:\t%s\t%s' % (self.name, self.value, typ, self.uid)
+		return '%s=%s:\t%s\t%s' % (self.name, self.value, typ, getUUIDName(self.uid, self.uid))
 
 class RSeDbRevisionInfo():
 	def __init__(self):
@@ -408,10 +460,11 @@ class RSeDbRevisionInfo():
 			v = '(%04X/%04X)' %(self.value1, self.value2)
 		else:
 			v = '(%04X/%04X/%04)' %(self.value1, self.value2, self.value3)
+		id = getUUIDName(self.ID, self.ID)
 		if (len(self.data) > 0):
-			return '%s,%s,[%s]' % (self.ID, v, IntArr2Str(self.data, 8))
+			return '%s,%s,[%s]' % (id, v, IntArr2Str(self.data, 8))
 		else:
-			return '%s,%s)' % (self.ID, v)
+			return '%s,%s)' % (id, v)
 
 class Thumbnail():
 	def __init__(self):
@@ -725,7 +778,35 @@ class ParameterNode(DataNode):
 		except Exception as e:
 			return u'(%04X): %s \'%s\'=%s - %s' %(self.index, self.typeName, self.name, x, e)
 
+	def getCompiled(self, node):
+		data = node.data
+		if (data.compiled is None):
+			data.compiled = {}
+		return data.compiled
+
 	def getParameterFormula(self, parameterData, withUnits):
+		'''
+		Returns the (sub-)formula of the parameter's expression. Each
+		sub-expression is rendered only once per output form (text or FreeCAD
+		expression, with or without units) - unsupported operations are
+		remembered as well and raised again.
+		'''
+		if (parameterData.data is None):
+			return self.buildParameterFormula(parameterData, withUnits)
+		compiled = self.getCompiled(parameterData)
+		key = (self.asText, withUnits)
+		subFormula = compiled.get(key)
+		if (subFormula is None):
+			try:
+				subFormula = self.buildParameterFormula(parameterData, withUnits)
+			except UserWarning as uw:
+				subFormula = uw
+			compiled[key] = subFormula
+		if (isinstance(subFormula, UserWarning)):
+			raise subFormula
+		return subFormula
+
+	def buildParameterFormula(self, parameterData, withUnits):
 		subFormula = ''
 		typeName   = parameterData.typeName
 
@@ -797,6 +878,17 @@ class ParameterNode(DataNode):
 	def getFormula(self, asText):
 		data = self.data
 		self.asText = asText
+		if (data):
+			compiled = self.getCompiled(self)
+			formula = compiled.get(asText)
+			if (formula is None):
+				formula = self.buildFormula(asText)
+				compiled[asText] = formula
+			return formula
+		return u''
+
+	def buildFormula(self, asText):
+		data = self.data
 		if (data):
 			refValue = data.get('refValue')
 			if (refValue):
@@ -814,6 +906,16 @@ class ParameterNode(DataNode):
 		return u''
 
 	def getValue(self):
+		if (self.data is None):
+			return self.buildValue()
+		compiled = self.getCompiled(self)
+		value = compiled.get('value')
+		if (value is None):
+			value = self.buildValue()
+			compiled['value'] = value
+		return value
+
+	def buildValue(self):
 		x = self.getValueRaw()
 		#unitRef = self.get('refUnit')
 		#type = unitRef.get('type')
@@ -950,6 +1052,19 @@ class ParameterValue():
 	def getTypeName(self):
 		return 'Parameter'
 
+class DimensionValue(ParameterValue):
+	'''
+	Replaces the parameter of a dimension that references a geometry (e.g. the
+	length of a line) instead of a parameter.
+	'''
+	def __init__(self, value):
+		ParameterValue.__init__(self, value)
+		self.typeName = 'Parameter'
+		self.name     = u''
+
+	def get(self, name):
+		return None
+
 class EnumNode(DataNode):
 	def __init__(self, data, isRef):
 		DataNode.__init__(self, data, isRef)
@@ -999,113 +1114,30 @@ class FeatureNode(DataNode):
 					return typ.get('Enum')
 		return None
 
+	def getSignature(self):
+		'''
+		Returns the type names of the properties that identify the kind of
+		feature (see _FeatureSignature).
+		'''
+		signature = []
+		for index, isEnum in _FeatureSignature:
+			if (isEnum):
+				signature.append(self._getPropertyEnumName(index))
+			else:
+				signature.append(self._getPropertyName(index))
+		return tuple(signature)
+
 	def getSubTypeName(self):
 		subTypeName = self.get('Feature')
 		if (subTypeName): return subTypeName
 
-		p0 = self._getPropertyName(0)
-		p1 = self._getPropertyName(1)
-		p4 = self._getPropertyName(4)
-
-		if (p4 == 'Face'):                          return 'Rip'
-		if (p0 == '90874D51'):
-			p4 = self._getPropertyName(4)
-			if (p4 == '7DAA0032'):                  return 'Chamfer'
-			if (p1 == 'Parameter'):                 return 'Bend'
-			if (p1 == 'FxExtend'):                  return 'Extend'
-			if (p1 is None):                        return 'CornerChamfer'
-		elif (p0 == 'SurfaceBodies'):
-			if (p1 == 'SolidBody'):                 return 'Combine'
-			if (p1 == 'SurfaceBody'):               return 'AliasFreeform'
-			if (p1 == 'SurfaceBodies'):             return 'CoreCavity'
-			if (p1 == 'Face'):
-				p7 = self._getPropertyEnumName(7)
-				if (p7 == 'EBB23D6E_Enum'):         return 'Refold'
-				if (p7 == '4688EBA3_Enum'):         return 'Unfold'
-		elif (p0 == 'Enum'):
-			p2 = self._getPropertyName(2)
-			p3 = self._getPropertyName(3)
-			if (p1 == 'FxBoundaryPatch'):
-				p6 = self._getPropertyName(6)
-				if (p2 == 'Line3D'):
-					if (p6 is None):                return 'Revolve'
-					if (p6 == 'ExtentType'):        return 'Extrude' #Map cut feature to extrusion!
-					return 'Coil'
-				elif (p2 == 'Direction'):
-					p10 = self._getPropertyName(0x10)
-					if (p6 == 'Parameter'):         return 'Emboss'
-					if (p10 == 'ParameterBoolean'): return 'Cut'
-					return 'Extrude'
-				return 'Coil'
-			if (p1 == 'FaceCollection'):            return 'Shell'
-			if (p1 == 'Parameter'):                 return 'Hole'
-			if (p1 == 'ParameterBoolean'):
-				if (p3 == 'Enum'):                  return 'Split'
-				if (p2 == 'ParameterBoolean'):      return 'Fold'
-			if (p2 == 'ParameterBoolean'):          return 'SnapFit'
-		elif (p0 == 'FxFilletConstant'):
-			p8 = self._getPropertyName(8)
-			if (p8 == 'ParameterBoolean'):          return 'CornerRound'
-			if (p8 == 'Enum'):                      return 'Fillet'
-		elif (p1 == 'FxFilletVariable'):            return 'Fillet'
-		elif (p0 == 'FaceCollection'):
-			if (p1 == 'Enum'):                      return 'FaceMove'
-			if (p1 == 'FaceCollection'):            return 'FaceReplace'
-			if (p1 == 'ParameterBoolean'):
-				p3 = self._getPropertyName(3)
-				if (p3 == 'SurfaceBodies'):         return 'FaceDelete'
-				if (p3 == 'Parameter'):             return 'Thread'
-		elif (p0 == 'FxBoundaryPatch'):
-			p2 = self._getPropertyName(2)
-			if (p2 == 'FxBoundaryPatch'):           return 'Grill'
-			if (p1 == 'FC203F47'):                  return 'Sweep'
-			if (p1 == 'A477243B'):                  return 'Sweep'
-			if (p1 == 'Direction'):                 return 'Extrude'
-			if (p1 == 'FxBoundaryPatch'):           return 'Rib'
-			if (p1 == 'SurfaceBody'):               return 'BoundaryPatch'
-			if (p1 == 'Parameter'):                 return 'Rest'
-			p4 = self._getPropertyName(4)
-			if (p4 == 'SurfaceBody'):               return 'BoundaryPatch'
-		elif (p0 == 'Direction'):
-			if (p1 == '90874D51'):                  return 'Lip'
-			if (p1 == 'FaceCollection'):            return 'FaceDraft'
-		elif (p0 == 'CA02411F'):                    return 'NonParametricBase'
-		elif (p0 == 'EB9E49B0'):                    return 'Freeform'
-		elif (p0 == 'FC203F47'):                    return 'Hem'
-		elif (p0 == 'SolidBody'):                   return 'Knit'
-		elif (p0 == 'SurfacesSculpt'):              return 'Sculpt'
-		elif (p0 == 'EA680672'):                    return 'Trim'
-		elif (p0 == 'SurfaceBody'):
-			if (p1 == 'A477243B'):                  return 'LoftedFlangeDefinition'
-			if (p1 == 'SurfaceBody'):               return 'Reference'
-		elif (p0 == '8677CE83'):                    return 'Corner'
-		elif (p0 == 'AFD8A8E0'):                    return 'Corner'
-		elif (p0 == 'LoftSections'):                return 'Loft'
-#		elif (p0 == 'Parameter'):                   return 'Loft'
-		elif (p0 == 'SurfaceSelection'):            return 'Thicken'
-		elif (p0 == 'Transformation'):
-			if (p1 == '8D6EF0BE'):                  return 'PatternRectangular'
-			# FIXME: This only works for the intersection example (e.g. Shaft1.ipt has other proeprties)!!!!
-			return 'iFeature'
-		elif (p0 is None):
-			p10 = self._getPropertyName(10)
-			if (p1 == 'Enum'):                      return 'Thicken'
-			if (p1 == '8B2B8D96'):                  return 'BoundaryPatch'
-			if (p1 == '90874D51'):                  return 'Lip'
-			if (p1 == 'FC203F47'):                  return 'ContourRoll'
-			if (p1 == 'SurfaceBody'):               return 'BoundaryPatch'
-			if (p10 == 'D524C30A'):                 return 'Fillet'
-		elif (p0 == 'D70E9DDA'):                    return 'Boss'
-		elif (p0 == 'ParameterBoolean'):            return 'FilletRule'
-
-		# Missing Features:
-		# - (Cosmetic-)Weld - only IAM files???
-		# - SurfaceMid -> FEM!
-		# - SurfaceRuled
-		# - PatternMove -> PatternRectangular
-		# - MeshPresentation
-		# - FaceOffset -> same as thicken but without solid fill!
-		return 'Unknown'
+		if (self.data.compiled is None):
+			self.data.compiled = {}
+		subTypeName = self.data.compiled.get('subTypeName')
+		if (subTypeName is None):
+			subTypeName = classifyFeature(self.getSignature())
+			self.data.compiled['subTypeName'] = subTypeName
+		return subTypeName
 
 	def getRefText(self): # return unicode
 		return u'(%04X): Fx%s \'%s\'' %(self.data.index, self.getSubTypeName(), self.name)
@@ -1354,6 +1386,7 @@ class ModelerTxnMgr():
 class AbstractData():
 	def __init__(self):
 		self.typeID       = None
+		self.blockType    = None   # RSeStorageBlockType
 		self.name         = None
 		self.index        = -1
 		self.parentIndex  = None
@@ -1370,6 +1403,7 @@ class AbstractData():
 		self.sketchPos    = None
 		self.valid        = True
 		self.handled      = False
+		self.compiled     = None   # cached results, e.g. parameter formulas (see ParameterNode) or units (see AbstractNode.getUnit)
 
 	def set(self, name, value):
 		'''
@@ -1440,4 +1474,117 @@ Functions  = Enum([''        , \
                    'atanh'   , \
                    'isolate'])
 
-FunctionsNotSupported = ['sign', 'random', 'acosh', 'asinh', 'atanh', 'isolate']
\ No newline at end of file
+FunctionsNotSupported = ['sign', 'random', 'acosh', 'asinh', 'atanh', 'isolate']
+
+# The properties of a feature that identify its kind: (index, enumeration name
+# instead of type name). The positions in the signature are:
+_P0, _P1, _P2, _P3, _P4, _P6, _E7, _P8, _P10, _P16 = range(10)
+_FeatureSignature = ((0, False), (1, False), (2, False), (3, False), (4, False), (6, False), (7, True), (8, False), (10, False), (16, False))
+
+# Rules to classify a feature by the type name of its first property. Each rule
+# is a tuple of the conditions ((position, type name), ...) and the feature's
+# name. The first rule whose conditions all match wins.
+_FilletVariable = (((_P1, 'FxFilletVariable'),), 'Fillet')
+_FeatureRules = {
+	'90874D51': [
+		(((_P4, '7DAA0032'),), 'Chamfer'),
+		(((_P1, 'Parameter'),), 'Bend'),
+		(((_P1, 'FxExtend'),), 'Extend'),
+		(((_P1, None),), 'CornerChamfer')],
+	'SurfaceBodies': [
+		(((_P1, 'SolidBody'),), 'Combine'),
+		(((_P1, 'SurfaceBody'),), 'AliasFreeform'),
+		(((_P1, 'SurfaceBodies'),), 'CoreCavity'),
+		(((_P1, 'Face'), (_E7, 'EBB23D6E_Enum')), 'Refold'),
+		(((_P1, 'Face'), (_E7, '4688EBA3_Enum')), 'Unfold')],
+	'Enum': [
+		(((_P1, 'FxBoundaryPatch'), (_P2, 'Line3D'), (_P6, None)), 'Revolve'),
+		(((_P1, 'FxBoundaryPatch'), (_P2, 'Line3D'), (_P6, 'ExtentType')), 'Extrude'), # Map cut feature to extrusion!
+		(((_P1, 'FxBoundaryPatch'), (_P2, 'Line3D')), 'Coil'),
+		(((_P1, 'FxBoundaryPatch'), (_P2, 'Direction'), (_P6, 'Parameter')), 'Emboss'),
+		(((_P1, 'FxBoundaryPatch'), (_P2, 'Direction'), (_P16, 'ParameterBoolean')), 'Cut'),
+		(((_P1, 'FxBoundaryPatch'), (_P2, 'Direction')), 'Extrude'),
+		(((_P1, 'FxBoundaryPatch'),), 'Coil'),
+		(((_P1, 'FaceCollection'),), 'Shell'),
+		(((_P1, 'Parameter'),), 'Hole'),
+		(((_P1, 'ParameterBoolean'), (_P3, 'Enum')), 'Split'),
+		(((_P1, 'ParameterBoolean'), (_P2, 'ParameterBoolean')), 'Fold'),
+		(((_P2, 'ParameterBoolean'),), 'SnapFit')],
+	'FxFilletConstant': [
+		(((_P8, 'ParameterBoolean'),), 'CornerRound'),
+		(((_P8, 'Enum'),), 'Fillet')],
+	# All following features: a variable fillet is checked first!
+	'FaceCollection': [
+		_FilletVariable,
+		(((_P1, 'Enum'),), 'FaceMove'),
+		(((_P1, 'FaceCollection'),), 'FaceReplace'),
+		(((_P1, 'ParameterBoolean'), (_P3, 'SurfaceBodies')), 'FaceDelete'),
+		(((_P1, 'ParameterBoolean'), (_P3, 'Parameter')), 'Thread')],
+	'FxBoundaryPatch': [
+		_FilletVariable,
+		(((_P2, 'FxBoundaryPatch'),), 'Grill'),
+		(((_P1, 'FC203F47'),), 'Sweep'),
+		(((_P1, 'A477243B'),), 'Sweep'),
+		(((_P1, 'Direction'),), 'Extrude'),
+		(((_P1, 'FxBoundaryPatch'),), 'Rib'),
+		(((_P1, 'SurfaceBody'),), 'BoundaryPatch'),
+		(((_P1, 'Parameter'),), 'Rest'),
+		(((_P4, 'SurfaceBody'),), 'BoundaryPatch')],
+	'Direction': [
+		_FilletVariable,
+		(((_P1, '90874D51'),), 'Lip'),
+		(((_P1, 'FaceCollection'),), 'FaceDraft')],
+	'CA02411F':         [_FilletVariable, ((), 'NonParametricBase')],
+	'EB9E49B0':         [_FilletVariable, ((), 'Freeform')],
+	'FC203F47':         [_FilletVariable, ((), 'Hem')],
+	'SolidBody':        [_FilletVariable, ((), 'Knit')],
+	'SurfacesSculpt':   [_FilletVariable, ((), 'Sculpt')],
+	'EA680672':         [_FilletVariable, ((), 'Trim')],
+	'SurfaceBody': [
+		_FilletVariable,
+		(((_P1, 'A477243B'),), 'LoftedFlangeDefinition'),
+		(((_P1, 'SurfaceBody'),), 'Reference')],
+	'8677CE83':         [_FilletVariable, ((), 'Corner')],
+	'AFD8A8E0':         [_FilletVariable, ((), 'Corner')],
+	'LoftSections':     [_FilletVariable, ((), 'Loft')],
+	'SurfaceSelection': [_FilletVariable, ((), 'Thicken')],
+	'Transformation': [
+		_FilletVariable,
+		(((_P1, '8D6EF0BE'),), 'PatternRectangular'),
+		# FIXME: This only works for the intersection example (e.g. Shaft1.ipt has other proeprties)!!!!
+		((), 'iFeature')],
+	None: [
+		_FilletVariable,
+		(((_P1, 'Enum'),), 'Thicken'),
+		(((_P1, '8B2B8D96'),), 'BoundaryPatch'),
+		(((_P1, '90874D51'),), 'Lip'),
+		(((_P1, 'FC203F47'),), 'ContourRoll'),
+		(((_P1, 'SurfaceBody'),), 'BoundaryPatch'),
+		(((_P10, 'D524C30A'),), 'Fillet')],
+	'D70E9DDA':         [_FilletVariable, ((), 'Boss')],
+	'ParameterBoolean': [_FilletVariable, ((), 'FilletRule')],
+}
+_FeatureRulesDefault = [_FilletVariable]
+
+def classifyFeature(signature):
+	'''
+	Returns the name of the feature for the signature of its properties (see
+	FeatureNode.getSignature) or 'Unknown'.
+	'''
+	if (signature[_P4] == 'Face'): return 'Rip'
+	for conditions, name in _FeatureRules.get(signature[_P0], _FeatureRulesDefault):
+		matches = True
+		for position, typeName in conditions:
+			if (signature[position] != typeName):
+				matches = False
+				break
+		if (matches): return name
+
+	# Missing Features:
+	# - (Cosmetic-)Weld - only IAM files???
+	# - SurfaceMid -> FEM!
+	# - SurfaceRuled
+	# - PatternMove -> PatternRectangular
+	# - MeshPresentation
+	# - FaceOffset -> same as thicken but without solid fill!
+	return 'Unknown'
\ No newline at end of file
@@ -6,11 +6,12 @@ Importer for the Document's components
 Simple approach to read/analyse Autodesk (R) Invetor (R) part file's (IPT) browser view data.
 The importer can read files from Autodesk (R) Invetor (R) Inventro V2010 on. Older versions will fail!
 '''
-from importerSegment        import SegmentReader, getNodeType
+from importerSegment        import SegmentReader, getBlockType
 from importerSegNode        import AbstractNode, DCNode, NodeRef
 from importerUtils          import *
 from importerClasses        import Tolerances, Functions
 from importerTransformation import Transformation
+from importerDump           import writeDump
 from math                   import pi
 import re
 
@@ -64,20 +65,18 @@ class DCReader(SegmentReader):
 		'''
 		offset = node.offset
 		nodeTypeID, i = getUInt8(data, offset - 4)
-		node.typeID = getNodeType(nodeTypeID, node.segment)
-		if (isinstance(node.typeID, UUID)):
-			node.typeName = '%08X' % (node.typeID.time_low)
-			i = offset + node.size
+		node.blockType = getBlockType(nodeTypeID, node.segment)
+		node.typeID    = node.blockType.typeID
+		node.typeName  = node.blockType.name
+		i = offset + node.size
+		s, dummy = getUInt32(data, i)
+		id = node.blockType.key
+		if ((s != node.size) and ((id == 0x2B48A42B) or (id == 0x90874D63))):
 			s, dummy = getUInt32(data, i)
-			id = node.typeID.time_low
-			if ((s != node.size) and ((id == 0x2B48A42B) or (id == 0x90874D63))):
+			while ((s != node.size) and (i < len(data))):
+				i += 1
 				s, dummy = getUInt32(data, i)
-				while ((s != node.size) and (i < len(data))):
-					i += 1
-					s, dummy = getUInt32(data, i)
-				node.size = i - offset
-		else:
-			node.typeName = '%08X' % (node.typeID)
+			node.size = i - offset
 
 		node.data = data[offset:offset + node.size]
 
@@ -255,6 +254,7 @@ class DCReader(SegmentReader):
 		n, i = getUInt16(node.data, offset)
 		m, i = getUInt16(node.data, i)
 		ref = NodeRef(n, m, type)
+		ref.offset = offset
 		if (ref.index > 0):
 			ref.number = number
 			node.childIndexes.append(ref)
@@ -1385,8 +1385,7 @@ class DCReader(SegmentReader):
 			buffer = node.data[i:i+size]
 			folder = getInventorFile()[0:-4]
 			filename = '%s\\%s_%04X.xls' %(folder, node.typeName, node.index)
-			with open(filename, 'wb') as xls:
-				xls.write(buffer)
+			writeDump(filename, buffer, False)
 			# logMessage('    >INFO - found workook: stored as %s!' %(filename), LOG.LOG_ERROR)
 		i += size
 		i = node.ReadList2(i, AbstractNode._TYP_1D_UINT32_, 'lst0')
@@ -0,0 +1,161 @@
+# -*- coding: utf8 -*-
+
+'''
+importerDaemon.py:
+
+Conversion server: keeps the importer loaded and converts Autodesk (R) Inventor (R)
+files into FreeCAD documents on request. The modules are imported only once per
+worker process. The documents created by a conversion are closed afterwards.
+
+Usage (FreeCAD's lib folder must be in the PYTHONPATH):
+	python importerDaemon.py [--port 8765] [--workers 2]
+Requests are POSTed as JSON {"file": "C:/parts/a.ipt", "target": "C:/parts/a.FCStd"}
+("target" is optional), the response is the JSON result of the conversion:
+{"file": ..., "document": ..., "parameters": [...], "timings": {...}} or
+{"file": ..., "error": ...}.
+'''
+
+import sys
+import os
+import json
+import tempfile
+import traceback
+import multiprocessing
+from timeit            import default_timer
+from BaseHTTPServer    import BaseHTTPRequestHandler, HTTPServer
+from SocketServer      import ThreadingMixIn
+
+__author__      = 'Jens M. Plonka'
+__copyright__   = 'Copyright 2017, Germany'
+__version__     = '0.6.0'
+__status__      = 'In-Development'
+
+DEFAULT_PORT    = 8765
+DEFAULT_WORKERS = 2
+
+# The pool of worker processes - the parser keeps its state in module globals,
+# so each conversion requires its own process.
+_pool = None
+
+def initWorker():
+	'''
+	Loads the importer once for all conversions done by this worker process.
+	'''
+	import Import_IPT
+	import importerDC      # loaded on first use otherwise
+	import importerFreeCAD
+	import importerProfiler
+	importerProfiler.setProfiling(True)
+	# don't add the profiling reports to the folders of the converted files
+	Import_IPT.reportFolder = tempfile.mkdtemp(prefix='InventorLoader')
+	return
+
+def getParameters(doc):
+	'''
+	Returns the content of the document's parameter table as list of dictionaries.
+	'''
+	parameters = []
+	table = doc.getObject('T_Parameters')
+	if (table is not None):
+		r = 2
+		name = table.getContents('A%d' %(r))
+		while (len(name) > 0):
+			parameter = {'name': name}
+			parameter['value']     = table.getContents('B%d' %(r))
+			parameter['formula']   = table.getContents('C%d' %(r))
+			parameter['tolerance'] = table.getContents('D%d' %(r))
+			parameter['comment']   = table.getContents('E%d' %(r))
+			parameters.append(parameter)
+			r += 1
+			name = table.getContents('A%d' %(r))
+	return parameters
+
+def convert(filename, target):
+	'''
+	Converts the file into a FreeCAD document (runs in a worker process).
+	'''
+	import FreeCAD
+	import Import_IPT
+	import importerProfiler
+	from importerReader import resetModel
+
+	result = {'file': filename}
+	t0 = default_timer()
+	documents = FreeCAD.listDocuments().keys()
+	try:
+		resetModel()
+		doc = Import_IPT.open(filename)
+		if (doc is None):
+			result['error'] = "Can't read '%s'!" %(filename)
+		else:
+			if (target is None):
+				target = os.path.splitext(filename)[0] + '.FCStd'
+			result['parameters'] = getParameters(doc)
+			doc.saveAs(target)
+			result['document'] = target
+	except Exception as e:
+		result['error'] = '%s' %(e)
+		result['traceback'] = traceback.format_exc()
+	finally:
+		# close all documents created by the conversion
+		for name in FreeCAD.listDocuments().keys():
+			if (name not in documents):
+				FreeCAD.closeDocument(name)
+	result['timings'] = {'total': default_timer() - t0, 'stages': importerProfiler.getReport()}
+	return result
+
+class ConversionHandler(BaseHTTPRequestHandler):
+	def do_POST(self):
+		try:
+			size    = int(self.headers.getheader('content-length', 0))
+			request = json.loads(self.rfile.read(size))
+			result  = _pool.apply(convert, (request['file'], request.get('target')))
+			code    = 200
+		except Exception as e:
+			result  = {'error': '%s' %(e)}
+			code    = 400
+		content = json.dumps(result)
+		self.send_response(code)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(content)))
+		self.end_headers()
+		self.wfile.write(content)
+		return
+
+class ConversionServer(ThreadingMixIn, HTTPServer):
+	# Requests are waiting for a free worker in their own thread.
+	daemon_threads = True
+
+def serve(port, workers):
+	global _pool
+
+	_pool = multiprocessing.Pool(workers, initWorker)
+	server = ConversionServer(('127.0.0.1', port), ConversionHandler)
+	sys.stdout.write('Converting Inventor files on port %d with %d workers ...\n' %(port, workers))
+	try:
+		server.serve_forever()
+	finally:
+		server.server_close()
+		_pool.terminate()
+	return
+
+def main(args):
+	port    = DEFAULT_PORT
+	workers = DEFAULT_WORKERS
+
+	i = 0
+	while (i < len(args)):
+		arg = args[i]
+		if (arg == '--port'):
+			i += 1
+			port = int(args[i])
+		elif (arg == '--workers'):
+			i += 1
+			workers = int(args[i])
+		i += 1
+
+	serve(port, workers)
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,114 @@
+# -*- coding: utf8 -*-
+
+'''
+importerDump.py:
+
+Writes the diagnostic dumps (segment logs, raw segment data, embedded files)
+into the export folder. The output is collected in large buffers and written
+by a background thread, so that the parser isn't waiting for the disk. With
+the preference 'Others.CompressDumps' the logs and raw data are stored gzip
+compressed ('.gz' is appended to the file name).
+'''
+
+import gzip
+import threading
+import Queue
+from importerUtils import getBoolPreference, logError
+
+__author__      = 'Jens M. Plonka'
+__copyright__   = 'Copyright 2017, Germany'
+__version__     = '0.6.0'
+__status__      = 'In-Development'
+
+# Buffered output is passed to the writer in chunks of this size.
+BUFFER_SIZE = 1 << 20
+
+# Number of chunks waiting to be written before the parser has to wait.
+QUEUE_SIZE  = 16
+
+_queue  = None
+_thread = None
+_errors = []
+
+def _write():
+	while (True):
+		file, chunk = _queue.get()
+		try:
+			if (chunk is None):
+				file.close()
+			else:
+				file.write(chunk)
+		except Exception as e:
+			_errors.append('%s: %s' %(file.name, e))
+		_queue.task_done()
+
+def _put(file, chunk):
+	global _queue, _thread
+
+	if (_thread is None):
+		_queue  = Queue.Queue(QUEUE_SIZE)
+		_thread = threading.Thread(target=_write, name='InventorLoaderDump')
+		_thread.daemon = True
+		_thread.start()
+	_queue.put((file, chunk))
+	return
+
+class DumpFile(object):
+	'''
+	File like object buffering the written text (unicode is stored as UTF-8)
+	or binary data for the background writer.
+	'''
+	def __init__(self, filename, compress):
+		if (compress):
+			self.file = gzip.open(filename + '.gz', 'wb')
+		else:
+			self.file = open(filename, 'wb')
+		self.chunks = []
+		self.size   = 0
+
+	def write(self, data):
+		if (isinstance(data, unicode)):
+			data = data.encode('utf8')
+		self.chunks.append(data)
+		self.size += len(data)
+		if (self.size >= BUFFER_SIZE):
+			self.flush()
+		return
+
+	def flush(self):
+		if (self.size > 0):
+			_put(self.file, ''.join(self.chunks))
+			self.chunks = []
+			self.size   = 0
+		return
+
+	def close(self):
+		self.flush()
+		_put(self.file, None)
+		return
+
+def openDump(filename, compressible = True):
+	'''
+	Returns the buffered file for the dump. Already compressed content (e.g.
+	zip files) should not be compressed again (compressible = False).
+	'''
+	return DumpFile(filename, compressible and getBoolPreference('Others.CompressDumps', False))
+
+def writeDump(filename, data, compressible = True):
+	dump = openDump(filename, compressible)
+	dump.write(data)
+	dump.close()
+	return
+
+def flushDumps():
+	'''
+	Waits until all closed dumps are written.
+	'''
+	global _errors
+
+	if (_queue is not None):
+		_queue.join()
+	for error in _errors:
+		logError('>E: Can\'t write dump %s' %(error))
+	_errors = []
+	return
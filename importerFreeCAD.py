@@ -10,10 +10,11 @@ import Sketcher
 import FreeCAD
 import traceback
 import re
-from importerUtils   import logMessage, logWarning, logError, LOG, IFF, IntArr2Str, FloatArr2Str, getFileVersion, isEqual
-from importerClasses import RSeMetaData, Scalar, Angle, Length, ParameterNode, ParameterTextNode, ValueNode, FeatureNode, AbstractValue, DataNode
+from importerUtils   import logMessage, logWarning, logError, LOG, IFF, IntArr2Str, FloatArr2Str, getFileVersion, isEqual, TOLERANCE, getBoolPreference
+from importerClasses import RSeMetaData, Scalar, Angle, Length, ParameterNode, ParameterTextNode, ValueNode, FeatureNode, AbstractValue, DataNode, DimensionValue
 from importerSegNode import AbstractNode, NodeRef
-from math            import sqrt, fabs, tan, degrees, pi
+from importerProfiler import startTimer, stopTimer, STAGE_CREATE, STAGE_SKETCH
+from math            import sqrt, fabs, tan, degrees, pi, floor
 
 __author__      = 'Jens M. Plonka'
 __copyright__   = 'Copyright 2017, Germany'
@@ -153,7 +154,7 @@ def isConstructionMode(node):
 	return False
 
 def isOrigo2D(vec2D):
-	return vec2D == (0,0)
+	return isEqual(vec2D[0], 0) and isEqual(vec2D[1], 0)
 
 def getDistancePointPoint(p, q):
 	return p2v(p).distanceToPoint(p2v(q))
@@ -217,9 +218,8 @@ def getCoincidentPos(sketchObj, point, entity):
 def addSketch2D(sketchObj, geometry, mode, entityNode):
 	geometry.Construction = mode
 	index = sketchObj.addGeometry(geometry, mode)
-	newGeo = sketchObj.Geometry[index]
-	entityNode.setSketchEntity(index, newGeo)
-	return newGeo
+	entityNode.setSketchEntity(index, geometry)
+	return geometry
 
 def addSketch3D(edges, geometry, mode, entityNode):
 	geometry.Construction = mode
@@ -266,15 +266,21 @@ def getNextLineIndex(coincidens, startIndex):
 	return len(coincidens)
 
 def getPlacement(node):
-	transformation = node.get('transformation')
-	matrix4x4      = transformation.getMatrix()
+	return getTransformationPlacement(node.get('transformation'))
+
+def getTransformationPlacement(transformation):
+	if (transformation.placement is None):
+		matrix4x4      = FreeCAD.Matrix(*transformation.getMatrix())
+
+		# convert centimeter to millimeter
+		matrix4x4.A14  *= 10.0
+		matrix4x4.A24  *= 10.0
+		matrix4x4.A34  *= 10.0
 
-	# convert centimeter to millimeter
-	matrix4x4.A14  *= 10.0
-	matrix4x4.A24  *= 10.0
-	matrix4x4.A34  *= 10.0
+		transformation.placement = FreeCAD.Placement(matrix4x4)
 
-	return FreeCAD.Placement(matrix4x4)
+	# the caller may change the placement
+	return FreeCAD.Placement(transformation.placement)
 
 def getFirstBodyName(ref):
 	name = ''
@@ -389,6 +395,60 @@ def replacePoint(edges, pOld, line, pNew):
 		return replaceEntity(edges, line, Part.Line(p2v(pNew), l.EndPoint))
 	return replaceEntity(edges, line, Part.Line(l.StartPoint, p2v(pNew)))
 
+def isInsideFace(face, other):
+	'''
+	Returns True if the face contains the other face (tested by its bounding box
+	and its first vertex - the wires of a boundary patch don't intersect).
+	'''
+	if (not face.BoundBox.isInside(other.BoundBox)): return False
+	return face.isInside(other.Vertexes[0].Point, TOLERANCE, True)
+
+def getContainmentDepths(faces):
+	'''
+	Returns for each face the number of other faces that contain it.
+	'''
+	depths = []
+	n = len(faces)
+	i = 0
+	while (i < n):
+		depth = 0
+		j = 0
+		while (j < n):
+			if ((i != j) and isInsideFace(faces[j], faces[i])):
+				depth += 1
+			j += 1
+		depths.append(depth)
+		i += 1
+	return depths
+
+def combineFaces(faces, fuses):
+	'''
+	Combines the faces of a boundary patch to a single face. The faces are
+	handled level by level of their containment depth - so an island inside a
+	hole is added after the hole was cut. All faces of a level are fused (or
+	cut) by a single multi-argument boolean operation.
+	faces: the faces of the closed wires, the first one is the base face.
+	fuses: for each face True if it has to be fused, False if it has to be cut.
+	'''
+	face   = faces[0]
+	depths = getContainmentDepths(faces)
+	level  = 0
+	while (level <= max(depths)):
+		added   = []
+		removed = []
+		i = 1
+		while (i < len(faces)):
+			if (depths[i] == level):
+				if (fuses[i]):
+					added.append(faces[i])
+				else:
+					removed.append(faces[i])
+			i += 1
+		if (len(added) > 0):   face = face.multiFuse(added)
+		if (len(removed) > 0): face = face.cut(removed)
+		level += 1
+	return face
+
 def createEdgeFromNode(wires, sketchEdge):
 	sketch = sketchEdge.get('refSketch')
 	e      = sketch.data.associativeIDs.get(sketchEdge.get('entityAI'))
@@ -444,6 +504,132 @@ def createEdgeFromNode(wires, sketchEdge):
 		wires.append(edge.toShape())
 	return
 
+class SketchBuffer():
+	'''
+	Collects the geometries and constraints of a sketch and adds them with a
+	single call of the Sketcher's list API (see flush). Indices are assigned
+	immediately; renames and expressions are applied after the constraints were
+	added. Methods that require the geometries in the sketch flush first.
+	'''
+	def __init__(self, sketchObj):
+		self.sketchObj       = sketchObj
+		self.geometryCount   = len(sketchObj.Geometry)
+		self.ConstraintCount = sketchObj.ConstraintCount
+		self.geometries      = []
+		self.constraints     = []
+		self.renames         = []
+		self.expressions     = []
+
+	def __getattr__(self, name):
+		return getattr(self.sketchObj, name)
+
+	def addGeometry(self, geometry, construction = False):
+		self.geometries.append(geometry)
+		self.geometryCount += 1
+		return self.geometryCount - 1
+
+	def addConstraint(self, constraint):
+		self.constraints.append(constraint)
+		self.ConstraintCount += 1
+		return self.ConstraintCount - 1
+
+	def renameConstraint(self, index, name):
+		self.renames.append((index, name))
+
+	def setExpression(self, path, expression):
+		self.expressions.append((path, expression))
+
+	def flushGeometries(self):
+		if (len(self.geometries) > 0):
+			# the construction mode is already set for each geometry
+			self.sketchObj.addGeometry(self.geometries, False)
+			self.geometries = []
+		return
+
+	def flush(self):
+		self.flushGeometries()
+		if (len(self.constraints) > 0):
+			self.sketchObj.addConstraint(self.constraints)
+			self.constraints = []
+		for index, name in self.renames:
+			self.sketchObj.renameConstraint(index, name)
+		self.renames = []
+		for path, expression in self.expressions:
+			self.sketchObj.setExpression(path, expression)
+		self.expressions = []
+		return
+
+	def isPointOnCurve(self, index, x, y):
+		self.flushGeometries()
+		return self.sketchObj.isPointOnCurve(index, x, y)
+
+	def getPoint(self, index, pos):
+		self.flushGeometries()
+		return self.sketchObj.getPoint(index, pos)
+
+class PointData():
+	'''
+	The sketch entities that share a 2D point.
+	'''
+	def __init__(self, vec2D):
+		self.vec2D      = vec2D # the first added coordinates
+		self.coincidens = []    # [entity, sketchIndex, pos]
+		self.entities   = set() # the indices of the entities in coincidens
+
+	def add(self, entity, pos):
+		self.coincidens.append([entity, entity.sketchIndex, pos])
+		self.entities.add(entity.index)
+
+	def remove(self, entityIndex):
+		if (entityIndex in self.entities):
+			self.entities.remove(entityIndex)
+			j = 0
+			while (j < len(self.coincidens)):
+				if (self.coincidens[j][0].index == entityIndex):
+					del self.coincidens[j]
+					return # there can only exists one element in the list!
+				j += 1
+		return
+
+class PointDataGrid():
+	'''
+	Spatial hash for the points of a sketch. Points with equal coordinates (see
+	isEqual) share the same PointData. The cell size is the tolerance, so that
+	matching points are always in the same or in a neighbouring cell.
+	'''
+	def __init__(self):
+		self.cells  = {}
+		self.points = []
+
+	def getCell(self, vec2D):
+		return (int(floor(vec2D[0] / TOLERANCE)), int(floor(vec2D[1] / TOLERANCE)))
+
+	def find(self, vec2D):
+		x, y = self.getCell(vec2D)
+		for i in (x - 1, x, x + 1):
+			for j in (y - 1, y, y + 1):
+				for data in self.cells.get((i, j), []):
+					if (isEqual(data.vec2D[0], vec2D[0]) and isEqual(data.vec2D[1], vec2D[1])):
+						return data
+		return None
+
+	def get(self, vec2D):
+		'''
+		Returns the PointData for the coordinates - a new one is created if required.
+		'''
+		data = self.find(vec2D)
+		if (data is None):
+			data = PointData(vec2D)
+			cell = self.getCell(vec2D)
+			if (cell not in self.cells):
+				self.cells[cell] = []
+			self.cells[cell].append(data)
+			self.points.append(data)
+		return data
+
+	def __iter__(self):
+		return iter(self.points)
+
 class FreeCADImporter:
 	FX_EXTRUDE_NEW          = 0x0001
 	FX_EXTRUDE_CUT          = 0x0002
@@ -462,7 +648,12 @@ class FreeCADImporter:
 		self.mapConstraints = None
 		self.pointDataDict  = None
 		self.bodyNodes      = {}
+		self.bodyWires      = {}
 		_initPreferences()
+		# Patterns as compounds of shape copies instead of Draft arrays
+		self.patternCompound = getBoolPreference('Others.PatternCompound', False)
+		# Merge chains of cuts and fusions into one operation with several tools
+		self.batchBooleans   = getBoolPreference('Others.BatchBooleans', False)
 
 
 	def getEntity(self, node):
@@ -472,8 +663,10 @@ class FreeCADImporter:
 				if (node.handled == False):
 					node.handled = True
 					if (node.valid):
+						t0 = startTimer()
 						importObject = getattr(self, 'Create_%s' %(node.typeName))
 						importObject(node)
+						stopTimer(STAGE_CREATE, node.typeName, t0)
 			except Exception as e:
 				logError('Error in creating (%04X): %s - %s'  %(node.index, node.typeName, e))
 				logError('>E: ' + traceback.format_exc())
@@ -598,8 +791,6 @@ class FreeCADImporter:
 			if (useExpression):
 				expression = dimension.get('alias')
 				sketchObj.setExpression('Constraints[%d]' %(number), expression)
-		else:
-			constraint.Name = 'Constraint%d' %(index)
 		return index
 
 	def adjustIndexPos(self, data, index, pos, point):
@@ -617,16 +808,12 @@ class FreeCADImporter:
 
 	def addCoincidentEntity(self, sketchObj, point, entity, pos):
 		if (entity.typeName != 'Point2D'):
-			vec2D = (getX(point), getY(point))
-			if (vec2D not in self.pointDataDict):
-				self.pointDataDict[vec2D] = []
-			coincidens = self.pointDataDict[vec2D]
-			for t in coincidens:
-				if (entity.index == t[0].index): return # already added -> done!
+			data = self.pointDataDict.get((getX(point), getY(point)))
+			if (entity.index in data.entities): return # already added -> done!
 			if (pos < 0):
 				pos = getCoincidentPos(sketchObj, point, entity)
 			if (pos != -1):
-				coincidens.append([entity, entity.sketchIndex, pos])
+				data.add(entity, pos)
 		return
 
 	def addCoincidentConstraint(self, fix, move, sketchObj):
@@ -654,10 +841,9 @@ class FreeCADImporter:
 		if (entity.typeName == 'Point2D'):
 			vec2D = (getX(entity), getY(entity))
 			if (isOrigo2D(vec2D)): return (-1, 1)
-			if (vec2D in self.pointDataDict):
-				coincidens = self.pointDataDict[vec2D]
-				if (len(coincidens) > 0):
-					return (coincidens[0][1], coincidens[0][2])
+			data = self.pointDataDict.find(vec2D)
+			if ((data is not None) and (len(data.coincidens) > 0)):
+				return (data.coincidens[0][1], data.coincidens[0][2])
 			return (createConstructionPoint(sketchObj, entity), 1)
 		return (entity.sketchIndex, None)
 
@@ -671,14 +857,12 @@ class FreeCADImporter:
 			vec2De = (getX(entity), getY(entity))
 			if (isOrigo2D(vec2De)): return (-1, 1) + self.findEntityPos(sketchObj, point)
 			# check if both point belongs to the same line
-			if ((vec2Dp in self.pointDataDict) and (vec2De in self.pointDataDict)):
-				lstP = self.pointDataDict[vec2Dp]
-				lstE = self.pointDataDict[vec2De]
-				for p in lstP:
-					if (p[0].typeName == 'Line2D'):
-						for e in lstE:
-							if (p[0].index == e[0].index):
-								return p[1], None, p[1], None
+			dataP = self.pointDataDict.find(vec2Dp)
+			dataE = self.pointDataDict.find(vec2De)
+			if ((dataP is not None) and (dataE is not None)):
+				for p in dataP.coincidens:
+					if ((p[0].typeName == 'Line2D') and (p[0].index in dataE.entities)):
+						return p[1], None, p[1], None
 			return self.findEntityPos(sketchObj, point) + self.findEntityPos(sketchObj, entity)
 		return None, None, None, None
 
@@ -732,6 +916,19 @@ class FreeCADImporter:
 					logWarning("        ... can't create dimension constraint between (%04X): %s and (%04X): %s - not supported by FreeCAD!" %(entity1.index, entity1.typeName[0:-2], entity2.index, entity2.typeName[0:-2]))
 		return
 
+	def getBodyWires(self, entity):
+		'''
+		Returns the wires of the entity's shape. They are cached for each body, the
+		document is only recomputed if the entity's shape isn't up to date.
+		'''
+		wires = self.bodyWires.get(entity.Name)
+		if ((wires is None) or ('Touched' in entity.State)):
+			if (('Touched' in entity.State) or entity.Shape.isNull()):
+				self.doc.recompute()
+			wires = entity.Shape.Wires
+			self.bodyWires[entity.Name] = wires
+		return wires
+
 	def profile2Section(self, participant):
 		face      = participant.get('refFace')
 		surface   = participant.data.segment.indexNodes[face.get('indexRefs')[0]]
@@ -754,13 +951,13 @@ class FreeCADImporter:
 		if (entity is not None):
 			# create an entity that can be featured (e.g. loft, sweep, ...)
 			section = newObject(self.doc, 'Part::Feature', participant.name)
-			self.doc.recompute()
+			wires   = self.getBodyWires(entity)
 
 			# FIXME: Howto convert Inventor-Indices to FreeCAD-Indices?
 			if (wireIndex == 0):   wireIndex = 1
 			elif (wireIndex == 1): wireIndex = 2
-			if (wireIndex < len(entity.Shape.Wires)):
-				section.Shape = entity.Shape.Wires[wireIndex]
+			if (wireIndex < len(wires)):
+				section.Shape = wires[wireIndex]
 			return section
 		return None
 
@@ -779,8 +976,9 @@ class FreeCADImporter:
 
 		if ((next.typeName == 'F9884C43') or (next.typeName == '424EB7D7') or (next.typeName == '603428AE')):
 			useFace = True
-			face = None
-			wire = None
+			wires = []
+			faces = []
+			fuses = []
 			boundarySketch   = next.get('refSketch')
 			if ((boundarySketch is not None) and (boundarySketch.typeName[0:-2] == 'Sketch')):
 				boundary = self.getEntity(boundarySketch) # ensure that the sketch is already created!
@@ -797,31 +995,25 @@ class FreeCADImporter:
 					shapeEdges += edges
 					if (len(edges) > 0):
 						w = Part.Wire(edges)
-						if (wire is None):
-							wire = w
-						else:
-							wire.fuse(w)
-
+						wires.append(w)
 						if (w.isClosed()):
-							f = Part.Face(w)
-							if(face is None):
-								face = f
-							else:
-								if (sketchEdges.get('operation') & 0x8):
-									face = face.fuse(f)
-								else:
-									cnt = 0 # force new shape!
-									face = face.cut(f)
+							faces.append(Part.Face(w))
+							fuses.append((sketchEdges.get('operation') & 0x8) != 0)
+							if ((len(faces) > 1) and (not fuses[-1])):
+								cnt = 0 # force new shape!
 						else:
 							useFace = False
 
 			if (len(shapeEdges) > 0):
 				# check if we can use the complete sketch
 				if (len(boundarySketch.data.sketchEdges) != cnt):
-					if (useFace and (face is not None)):
-						face = face.removeSplitter()
+					wire = wires[0]
+					if (useFace and (len(faces) > 0)):
+						face = combineFaces(faces, fuses).removeSplitter()
 						if (len(face.Wires) > 1):
 							wire = face.Wires[0].multiFuse(face.Wires[1:])
+					elif (len(wires) > 1):
+						wire = wire.multiFuse(wires[1:])
 					boundary = newObject(self.doc, 'Part::Feature', '%s_bp' %sketch.name)
 					boundary.Shape = wire
 					boundary.Placement = sketch.sketchEntity.Placement.copy()
@@ -864,6 +1056,57 @@ class FreeCADImporter:
 			adjustViewObject(booleanGeo, baseGeo)
 		return booleanGeo
 
+	def mergeCut(self, cutGeo, tools):
+		'''
+		Merges Cut(Cut(base, tool1), tool2) into Cut(base, MultiFuse(tool1, tool2)).
+		'''
+		baseGeo = cutGeo.Base
+		toolGeo = cutGeo.Tool
+		if (toolGeo.Name in tools):
+			shapes = toolGeo.Shapes
+		else:
+			shapes = [toolGeo]
+			toolGeo = newObject(self.doc, 'Part::MultiFuse', cutGeo.Name + '_t')
+			tools[toolGeo.Name] = toolGeo
+			self.hide([toolGeo])
+		user = cutGeo.InList[0]
+		toolGeo.Shapes = shapes + [user.Tool]
+		user.Base = baseGeo
+		user.Tool = toolGeo
+		return
+
+	def isFirstArgument(self, geo, user):
+		if (geo.TypeId != user.TypeId):
+			return False
+		if (geo.TypeId == 'Part::Cut'):
+			return (user.Base is not None) and (user.Base.Name == geo.Name)
+		if (geo.TypeId == 'Part::MultiFuse'):
+			return (len(user.Shapes) > 0) and (user.Shapes[0].Name == geo.Name)
+		return False
+
+	def mergeBooleans(self):
+		'''
+		Merges consecutive booleans: a cut (or fusion) that is only used as base of
+		the next cut (or as first shape of the next fusion) is replaced by adding its
+		tools to the next one. So the tools are fused in one multi-argument
+		operation and the base is cut only once instead of once per feature.
+		'''
+		tools  = {} # the tool fusions created by merging cuts
+		merged = []
+		for geo in self.doc.Objects:
+			if ((len(geo.InList) == 1) and self.isFirstArgument(geo, geo.InList[0])):
+				if (geo.TypeId == 'Part::Cut'):
+					self.mergeCut(geo, tools)
+					merged.append(geo)
+				elif (geo.Name not in tools):
+					user = geo.InList[0]
+					user.Shapes = geo.Shapes + user.Shapes[1:]
+					merged.append(geo)
+		for geo in merged:
+			self.doc.removeObject(geo.Name)
+		logMessage('    merged %d boolean operations' %(len(merged)), LOG.LOG_INFO)
+		return
+
 	def createCone(self, name, diameter2, angle, diameter1):
 		R1 = getMM(diameter1) / 2
 		R2 = getMM(diameter2) / 2
@@ -1159,9 +1402,7 @@ class FreeCADImporter:
 		return
 
 	def addSketch_Point2D(self, pointNode, sketchObj):
-		vec2D = (getX(pointNode), getY(pointNode))
-		if (vec2D not in self.pointDataDict):
-			self.pointDataDict[vec2D] = []
+		self.pointDataDict.get((getX(pointNode), getY(pointNode)))
 		pointNode.valid = False
 		return
 
@@ -1174,16 +1415,9 @@ class FreeCADImporter:
 	def addSketch_Point3D(self, pointNode, edges): return
 
 	def removeFromPointRef(self, point, index):
-		vec2D = (getX(point), getY(point))
-		if (vec2D in self.pointDataDict):
-			constraints = self.pointDataDict[vec2D]
-			j = 0
-			while (j < len(constraints)):
-				entity, index, pos = constraints[j]
-				if (entity.index == index):
-					del constraints[j]
-					return # there can only exists one element in the list!
-				j += 1
+		data = self.pointDataDict.find((getX(point), getY(point)))
+		if (data is not None):
+			data.remove(index)
 		return
 
 	def invalidateLine2D(self, lineNode):
@@ -1607,8 +1841,10 @@ class FreeCADImporter:
 		if ((node.handled == False) and (node.valid)):
 			node.handled = True
 			try:
+				t0 = startTimer()
 				addSketchObj = getattr(self, 'addSketch_%s' %(node.typeName))
 				addSketchObj(node, sketchObj)
+				stopTimer(STAGE_SKETCH, node.typeName, t0)
 				self.handleAssociativeID(node)
 
 			except Exception as e:
@@ -1620,8 +1856,10 @@ class FreeCADImporter:
 		if ((node.handled == False) and (node.valid)):
 			node.handled = True
 			try:
+				t0 = startTimer()
 				addSketchObj = getattr(self, 'addSketch_%s' %(node.typeName))
 				addSketchObj(node, edges)
+				stopTimer(STAGE_SKETCH, node.typeName, t0)
 				self.handleAssociativeID(node)
 
 			except Exception as e:
@@ -1630,8 +1868,9 @@ class FreeCADImporter:
 		return
 
 	def addSketch_PostCreateCoincidences(self, sketchObj):
-		for vec2D in self.pointDataDict.keys():
-			constraints = self.pointDataDict[vec2D]
+		for data in self.pointDataDict:
+			vec2D = data.vec2D
+			constraints = data.coincidens
 			if (isOrigo2D(vec2D)):
 				fix = (sketchObj.getPoint(-1, 0), -1, 1)
 			elif (len(constraints) > 1):
@@ -1658,9 +1897,10 @@ class FreeCADImporter:
 		logMessage('    adding 2D-Sketch \'%s\' ...' %(sketch2D.Label), LOG.LOG_INFO)
 		sketch2D.Placement = getPlacement(sketchNode.get('refTransformation'))
 		sketchNode.setSketchEntity(-1, sketch2D)
+		sketch = SketchBuffer(sketch2D)
 		geos = []
 		dims = []
-		self.pointDataDict = {}
+		self.pointDataDict = PointDataGrid()
 		sketchNode.data.sketchEdges = {}
 		sketchNode.data.associativeIDs = {}
 
@@ -1670,18 +1910,20 @@ class FreeCADImporter:
 			elif (child.typeName.startswith('Dimension_')):
 				dims.append(child)
 			else:
-				self.Create_Sketch2D_Node(sketch2D, child.node)
+				self.Create_Sketch2D_Node(sketch, child.node)
 
 		for g in geos:
-			self.Create_Sketch2D_Node(sketch2D, g.node)
+			self.Create_Sketch2D_Node(sketch, g.node)
 
-		# need to recompute otherwise FreeCAD messes up directions for other constraints!
-		if (self.doc): self.doc.recompute()
+		# need to solve otherwise FreeCAD messes up directions for other constraints!
+		sketch.flush()
+		sketch2D.solve()
 
 		for d in dims:
-			self.Create_Sketch2D_Node(sketch2D, d.node)
+			self.Create_Sketch2D_Node(sketch, d.node)
 
-		self.addSketch_PostCreateCoincidences(sketch2D)
+		self.addSketch_PostCreateCoincidences(sketch)
+		sketch.flush()
 
 		if (self.root):
 			self.root.addObject(sketch2D)
@@ -1697,7 +1939,7 @@ class FreeCADImporter:
 		geos = []
 		dims = []
 		edges = {}
-		self.pointDataDict = {}
+		self.pointDataDict = PointDataGrid()
 		sketchNode.data.sketchEdges = {}
 		sketchNode.data.associativeIDs = {}
 
@@ -1955,16 +2197,17 @@ class FreeCADImporter:
 					if (baseGeo.isDerivedFrom('Part::Cut')):
 						cutGeo = baseGeo
 						baseGeo = cutGeo.Tool
-					patternGeo = Draft.makeArray(baseGeo, center, angle.getGRAD(), count, None, namePart)
-
-					patternGeo.Axis = axis
+					if (self.patternCompound):
+						patternGeo = self.createPatternCompound(namePart, baseGeo, self.getPolarPlacements(center, axis, angle.getGRAD(), int(count)))
+					else:
+						patternGeo = Draft.makeArray(baseGeo, center, angle.getGRAD(), count, None, namePart)
+						patternGeo.Axis = axis
 
 					setDefaultViewObject(patternGeo)
 					geos.append(patternGeo)
 				namePart = '%s_%d' % (name, len(geos))
 			if (len(geos) > 1):
-				patternGeo = self.createEntity(patternNode, 'Part::MultiFuse')
-				patternGeo.Shapes = geos
+				patternGeo = self.combinePatterns(patternNode, geos, cutGeo)
 			if (patternGeo is not None):
 				if (cutGeo):
 					cutGeo.Tool = patternGeo
@@ -1972,6 +2215,63 @@ class FreeCADImporter:
 					self.addSolidBody(patternNode, patternGeo, solidRef)
 		return
 
+	def createPatternCompound(self, name, baseGeo, placements):
+		'''
+		Creates the instances of a pattern as compound of the base's shape moved
+		to each placement. The instances share the base shape's geometry - only
+		their locations differ - so the memory stays proportional to a single
+		instance. The instances will not be fused!
+		'''
+		if (('Touched' in baseGeo.State) or baseGeo.Shape.isNull()):
+			self.doc.recompute()
+		prototype = baseGeo.Shape
+		shapes = []
+		for placement in placements:
+			shape = Part.Shape(prototype)
+			shape.Placement = placement.multiply(prototype.Placement)
+			shapes.append(shape)
+		patternGeo = newObject(self.doc, 'Part::Feature', name)
+		patternGeo.Shape = Part.makeCompound(shapes)
+		self.hide([baseGeo])
+		return patternGeo
+
+	def getPolarPlacements(self, center, axis, angle, count):
+		fraction = angle
+		if (isEqual(angle, 360.0)):
+			fraction = angle / count
+		elif (count > 1):
+			fraction = angle / (count - 1)
+		placements = []
+		i = 0
+		while (i < count):
+			placements.append(FreeCAD.Placement(FreeCAD.Vector(), FreeCAD.Rotation(axis, fraction * i), center))
+			i += 1
+		return placements
+
+	def getRectangularPlacements(self, dir1, dir2, count1, count2):
+		placements = []
+		j = 0
+		while (j < count2):
+			i = 0
+			while (i < count1):
+				placements.append(FreeCAD.Placement(dir1 * i + dir2 * j, FreeCAD.Rotation()))
+				i += 1
+			j += 1
+		return placements
+
+	def combinePatterns(self, patternNode, geos, cutGeo):
+		'''
+		Combines the patterns of several participants. A pattern used as tool of a
+		cut doesn't need to be fused - a compound is sufficient.
+		'''
+		if ((cutGeo is not None) and self.patternCompound):
+			patternGeo = self.createEntity(patternNode, 'Part::Compound')
+			patternGeo.Links = geos
+		else:
+			patternGeo = self.createEntity(patternNode, 'Part::MultiFuse')
+			patternGeo.Shapes = geos
+		return patternGeo
+
 	def adjustMidplane(self, pattern, direction, distance, fitted, count):
 		d = getMM(distance) / 2.0
 		if (isTrue(fitted) == False):
@@ -2039,7 +2339,10 @@ class FreeCADImporter:
 					if (baseGeo.isDerivedFrom('Part::Cut')):
 						cutGeo = baseGeo
 						if (cutGeo.Tool): baseGeo = cutGeo.Tool
-					patternGeo = Draft.makeArray(baseGeo, dir1, dir2, count1, count2, namePart)
+					if (self.patternCompound):
+						patternGeo = self.createPatternCompound(namePart, baseGeo, self.getRectangularPlacements(dir1, dir2, int(count1), int(count2)))
+					else:
+						patternGeo = Draft.makeArray(baseGeo, dir1, dir2, count1, count2, namePart)
 
 					if (isTrue(midplane1Ref)): self.adjustMidplane(patternGeo, dir1Ref, distance1Ref, fitted1Ref, count1Ref)
 					if (isTrue(midplane2Ref)): self.adjustMidplane(patternGeo, dir2Ref, distance2Ref, fitted2Ref, count2Ref)
@@ -2048,8 +2351,7 @@ class FreeCADImporter:
 					geos.append(patternGeo)
 				namePart = '%s_%d' % (name, len(geos))
 			if (len(geos) > 1):
-				patternGeo = self.createEntity(patternNode, 'Part::MultiFuse')
-				patternGeo.Shapes = geos
+				patternGeo = self.combinePatterns(patternNode, geos, cutGeo)
 			if (patternGeo is not None):
 				if (cutGeo):
 					cutGeo.Tool = patternGeo
@@ -2119,6 +2421,36 @@ class FreeCADImporter:
 
 		return
 
+	def placeHoleTool(self, name, toolGeo, placement, points):
+		'''
+		Moves the hole's tool to its center point. A hole with several center
+		points is cut with one compound of copies of the tool's shape, so that a
+		single boolean operation is required instead of one per point.
+		'''
+		matrix = placement.toMatrix()
+		if (len(points) < 2):
+			vec3D = None
+			if (len(points) == 1):
+				vec3D = matrix.multiply(p2v(points[0]))
+			setPlacement(toolGeo, placement, vec3D)
+			return toolGeo
+
+		self.doc.recompute()
+		prototype = toolGeo.Shape
+		shapes = []
+		for point in points:
+			pl = FreeCAD.Placement(placement)
+			pl.Base = matrix.multiply(p2v(point))
+			shape = prototype.copy()
+			shape.Placement = pl
+			shapes.append(shape)
+		holesGeo = newObject(self.doc, 'Part::Feature', name + '_t')
+		holesGeo.Shape = Part.makeCompound(shapes)
+		adjustViewObject(holesGeo, toolGeo)
+		self.hide([toolGeo])
+		logMessage("        ... %d holes with one tool" %(len(shapes)), LOG.LOG_DEBUG)
+		return holesGeo
+
 	def Create_FxHole(self, holeNode):
 		name           = holeNode.name
 		defRef         = holeNode.get('label')
@@ -2148,7 +2480,6 @@ class FreeCADImporter:
 		#    = getProperty(properties, 0x16)	#
 		# 0x17 ???
 		baseData      = getProperty(properties, 0x18)
-		vec3D         = None
 
 		if (holeType is not None):
 			base = self.findBase(baseData.next)
@@ -2158,50 +2489,45 @@ class FreeCADImporter:
 			else:
 				placement = getPlacement(transformation)
 				holeGeo   = None
+				toolGeo   = None
+				points    = []
 				if (centerPoints):
-					offset = centerPoints.get('points')[0]
-					vec3D = placement.toMatrix().multiply(p2v(offset))
+					for point in centerPoints.get('points'):
+						if (point is not None): points.append(point)
 				if (holeType.get('value') == FreeCADImporter.FX_HOLE_DRILLED):
 					logMessage("    adding drilled FxHole '%s' ..." %(name), LOG.LOG_INFO)
+					holeKind = ''
 					geos, h = self.createCylinder(name + '_l', holeDiam_1, holeDepth_1, pointAngle)
 					if (len(geos) > 1):
-						geo1 = self.createBoolean('MultiFuse', name + '_h', geos[0], geos[1:])
-						setPlacement(geo1, placement, vec3D)
-						holeGeo = self.createBoolean('Cut', name, base, [geo1])
+						toolGeo = self.createBoolean('MultiFuse', name + '_h', geos[0], geos[1:])
 					else:
-						setPlacement(geos[0], placement, vec3D)
-						holeGeo = self.createBoolean('Cut', name, base, geos[0:1])
-					if (holeGeo is None):
-						logError("        ... Failed to create hole!")
+						toolGeo = geos[0]
 				else:
 					geos, h1 = self.createCylinder(name + '_l', holeDiam_1, holeDepth_1, pointAngle)
 					if (holeType.get('value') == FreeCADImporter.FX_HOLE_SINK):
 						logMessage("    adding counter sink FxHole '%s' ..." %(name), LOG.LOG_INFO)
+						holeKind = 'counter sink '
 						geo2, h2 = self.createCone(name + '_2', holeDiam_2, holeAngle_2, holeDiam_1)
-						holeGeo = self.createBoolean('MultiFuse', name + '_h', geo2, geos)
-						setPlacement(holeGeo, placement, vec3D)
-						holeGeo = self.createBoolean('Cut', name, base, [holeGeo])
-						if (holeGeo is None):
-							logError("        ... Failed to create counter sink hole!")
+						toolGeo = self.createBoolean('MultiFuse', name + '_h', geo2, geos)
 					elif (holeType.get('value') == FreeCADImporter.FX_HOLE_BORED):
 						logMessage("    adding counter bored FxHole '%s' ..." %(name), LOG.LOG_INFO)
+						holeKind = 'counter bored '
 						geo2, h2 = self.createCylinder(name + '_2', holeDiam_2, holeDepth_2, None)
-						holeGeo = self.createBoolean('MultiFuse', name + '_h', geo2[0], geos)
-						setPlacement(holeGeo, placement, vec3D)
-						holeGeo = self.createBoolean('Cut', name, base, [holeGeo])
-						if (holeGeo is None):
-							logError("        ... Failed to create counter bored hole!")
+						toolGeo = self.createBoolean('MultiFuse', name + '_h', geo2[0], geos)
 					elif (holeType.get('value') == FreeCADImporter.FX_HOLE_SPOT):
 						logMessage("    adding spot face FxHole '%s' ..." %(name), LOG.LOG_INFO)
+						holeKind = 'spot face '
 						geo2, h2 = self.createCylinder(name + '_2', holeDiam_2, holeDepth_2, None)
-						holeGeo = self.createBoolean('MultiFuse', name + '_h', geo2[0], geos)
-						setPlacement(holeGeo, placement, vec3D)
-						holeGeo = self.createBoolean('Cut', name, base, [holeGeo])
-						if (holeGeo is None):
-							logError("        ... Failed to create spot face hole!")
+						toolGeo = self.createBoolean('MultiFuse', name + '_h', geo2[0], geos)
 					else:
 						logError("ERROR> Unknown hole type %s!" %(holeType.get('value')))
 
+				if (toolGeo is not None):
+					toolGeo = self.placeHoleTool(name, toolGeo, placement, points)
+					holeGeo = self.createBoolean('Cut', name, base, [toolGeo])
+					if (holeGeo is None):
+						logError("        ... Failed to create %shole!" %(holeKind))
+
 				if (holeGeo is not None):
 					self.addSolidBody(holeNode, holeGeo, getProperty(properties, 0x18))
 
@@ -2549,9 +2875,11 @@ class FreeCADImporter:
 		name  = featureNode.getSubTypeName()
 		index = featureNode.index
 		logMessage("    adding Fx%s '%s' ..." %(name, featureNode.name), LOG.LOG_INFO)
+		t0 = startTimer()
 		createFxObj = getattr(self, 'Create_Fx%s' %(name))
 		createFxObj(featureNode)
 		self.doc.recompute()
+		stopTimer(STAGE_CREATE, 'Fx%s' %(name), t0)
 		return
 
 	def addSketch_Spline3D_Curve(self, bezierNode, edges):
@@ -2689,35 +3017,34 @@ class FreeCADImporter:
 					return seg
 		return None
 
-	def addParameterTableTolerance(self, table, r, tolerance):
+	def addParameterTableTolerance(self, cells, r, tolerance):
 		if (tolerance):
-			table.set('D%d' %(r), tolerance.encode('utf8'))
+			cells.append(('D%d' %(r), tolerance.encode('utf8')))
 			return u'; D%d=\'%s\'' %(r, tolerance)
 		return u''
 
-	def addParameterTableComment(self, table, r, commentRef):
+	def addParameterTableComment(self, cells, r, commentRef):
 		if (commentRef):
 			comment = commentRef.name
 			if (comment):
-				table.set('E%d' %(r), comment.encode('utf8'))
+				cells.append(('E%d' %(r), comment.encode('utf8')))
 				return u'; E%d=\'%s\'' %(r, comment)
 		return u''
 
-	def addOperandParameter(self, table, nextRow, parameters, operandRef):
+	def addOperandParameter(self, order, pending, parameters, operandRef):
 		if (operandRef):
-			return self.addReferencedParameters(table, nextRow, parameters, operandRef)
-		return nextRow
+			self.addReferencedParameters(order, pending, parameters, operandRef)
+		return
 
-	def addReferencedParameters(self, table, r, parameters, value):
-		nextRow = r
+	def addReferencedParameters(self, order, pending, parameters, value):
 		typeName   = value.typeName
 
 		if (typeName == 'ParameterRef'):
 			parameterData = value.get('refParameter').data
-			nextRow = self.addParameterToTable(table, nextRow, parameters, parameterData.name)
+			self.addParameterToOrder(order, pending, parameters, parameterData.name)
 		elif (typeName.startswith('ParameterOperation')):
-			nextRow = self.addOperandParameter(table, nextRow, parameters, value.get('refOperand1'))
-			nextRow = self.addOperandParameter(table, nextRow, parameters, value.get('refOperand2'))
+			self.addOperandParameter(order, pending, parameters, value.get('refOperand1'))
+			self.addOperandParameter(order, pending, parameters, value.get('refOperand2'))
 		elif (typeName == 'ParameterValue'):
 			pass # Nothing to do here!
 		else:
@@ -2726,23 +3053,28 @@ class FreeCADImporter:
 				typeName   = value.typeName
 
 				if (typeName == 'ParameterUnaryMinus'):
-					nextRow = self.addReferencedParameters(table, nextRow, parameters, value)
+					self.addReferencedParameters(order, pending, parameters, value)
 				elif (typeName == 'ParameterRef'):
 					parameterData = value.get('refParameter').data
-					nextRow = self.addParameterToTable(table, nextRow, parameters, parameterData.name)
+					self.addParameterToOrder(order, pending, parameters, parameterData.name)
 				elif (typeName == 'ParameterFunction'):
 					operandRefs = value.get('operands')
-					sep = '('
 					for operandRef in operandRefs:
-						nextRow = self.addReferencedParameters(table, nextRow, parameters, operandRef)
+						self.addReferencedParameters(order, pending, parameters, operandRef)
 				elif (typeName.startswith('ParameterOperation')):
-					nextRow = self.addOperandParameter(table, nextRow, parameters, value.get('refOperand1'))
-					nextRow = self.addOperandParameter(table, nextRow, parameters, value.get('refOperand2'))
+					self.addOperandParameter(order, pending, parameters, value.get('refOperand1'))
+					self.addOperandParameter(order, pending, parameters, value.get('refOperand2'))
 				elif (typeName == 'ParameterOperationPowerIdent'):
-					nextRow = self.addReferencedParameters(table, nextRow, parameters, value.get('refOperand1'))
-		return nextRow
+					self.addReferencedParameters(order, pending, parameters, value.get('refOperand1'))
+		return
 
-	def addParameterToTable(self, table, r, parameters, key):
+	def addParameterToOrder(self, order, pending, parameters, key):
+		'''
+		Appends the key to the order of the parameter table - after all the
+		parameters it references (depth first), so that each parameter comes
+		after the parameters its formula depends on.
+		pending: the keys of the parameters currently visited - to detect cycles.
+		'''
 		if (key in parameters):
 			valueNode = parameters[key].node
 
@@ -2753,77 +3085,95 @@ class FreeCADImporter:
 			elif (isinstance(valueNode, ValueNode)):
 				pass
 			else:
-				return r
+				return
 
-			if ((valueNode is not None) and (valueNode.handled != True)):
+			if (key in pending):
+				logWarning(u'    >WARNING: cyclic parameter reference: %s -> %s!' %(u' -> '.join(pending), key))
+			elif ((valueNode is not None) and (valueNode.handled != True)):
 				valueNode.handled = True
-				mdlValue = u''
-				tlrValue = u''
-				remValue = u''
 				valueNode.set('alias', 'T_Parameters.%s_' %(key))
-				typeName = valueNode.typeName
-
-				if (typeName == 'Parameter'):
-					r = self.addReferencedParameters(table, r, parameters, valueNode)
-					#nominalValue = getNominalValue(valueNode)
-					#nominalFactor = valueNode.getUnitFactor()
-					#nominalOffset = valueNode.getUnitOffset()
-					#nominalUnit  = valueNode.data.getUnitName()
-					#if (len(nominalUnit) > 0): nominalUnit = ' ' + nominalUnit
-					#formula = '%s%s' %((nominalValue / nominalFactor)  - nominalOffset, nominalUnit)
-					value   = valueNode.getValue().__str__()
-					formula = valueNode.getFormula(True)
-					table.set('A%d' %(r), key.encode('utf8'))
-					table.set('B%d' %(r), value.encode('utf8'))
-					table.set('C%d' %(r), formula.encode('utf8'))
-					mdlValue = '; C%s=%s' %(r, formula)
-					tlrValue = self.addParameterTableTolerance(table, r, valueNode.get('tolerance'))
-					remValue = self.addParameterTableComment(table, r, valueNode.get('label'))
-				elif (typeName == 'ParameterText'):
-					value = valueNode.get('value')
-					table.set('A%d' %(r), key.encode('utf8'))
-					table.set('B%d' %(r), '\'%s' %(value.encode('utf8')))
-					remValue = self.addParameterTableComment(table, r, valueNode.get('label'))
-				elif (typeName == 'ParameterBoolean'):
-					value = valueNode.get('value')
-					table.set('A%d' %(r), key.encode('utf8'))
-					if (isinstance(value, bool)):
-						table.set('B%d' %(r), str(value))
-					else:
-						table.set('B%d' %(r), value.encode('utf8'))
-					remValue = self.addParameterTableComment(table, r, valueNode.get('label'))
-				else: #if (key.find('RDxVar') != 0):
-					value = valueNode
-					table.set('A%d' %(r), '%s' %(key.encode('utf8')))
-					table.set('B%d' %(r), '%s' %(value.encode('utf8')))
-					remValue = self.addParameterTableComment(table, r, valueNode.get('label'))
-
-				if (key.find('RDxVar') != 0):
-					try:
-						aliasValue = '%s_' %(key.replace(':', '_'))
-						table.setAlias('B%d' %(r), aliasValue.encode('utf8'))
-					except Exception as e:
-						logError(u'    >ERROR: Can\'t set alias name for B%d - invalid name \'%s\' - %s!' %(r, aliasValue, e))
-
-					logMessage(u'        A%d=\'%s\'; B%d=\'%s\'%s\'%s%s' %(r, key, r, value, mdlValue, tlrValue, remValue), LOG.LOG_DEBUG)
-					return r + 1
+				if (valueNode.typeName == 'Parameter'):
+					pending.append(key)
+					self.addReferencedParameters(order, pending, parameters, valueNode)
+					pending.pop()
+				order.append(key)
 		else:
 			assert False, 'ERROR: %s not found in parameters!' %(key)
+		return
+
+	def addParameterToTable(self, cells, aliases, r, parameters, key):
+		valueNode = parameters[key].node
+		mdlValue = u''
+		tlrValue = u''
+		remValue = u''
+		typeName = valueNode.typeName
+
+		if (typeName == 'Parameter'):
+			#nominalValue = getNominalValue(valueNode)
+			#nominalFactor = valueNode.getUnitFactor()
+			#nominalOffset = valueNode.getUnitOffset()
+			#nominalUnit  = valueNode.data.getUnitName()
+			#if (len(nominalUnit) > 0): nominalUnit = ' ' + nominalUnit
+			#formula = '%s%s' %((nominalValue / nominalFactor)  - nominalOffset, nominalUnit)
+			value   = valueNode.getValue().__str__()
+			formula = valueNode.getFormula(True)
+			cells.append(('A%d' %(r), key.encode('utf8')))
+			cells.append(('B%d' %(r), value.encode('utf8')))
+			cells.append(('C%d' %(r), formula.encode('utf8')))
+			mdlValue = '; C%s=%s' %(r, formula)
+			tlrValue = self.addParameterTableTolerance(cells, r, valueNode.get('tolerance'))
+			remValue = self.addParameterTableComment(cells, r, valueNode.get('label'))
+		elif (typeName == 'ParameterText'):
+			value = valueNode.get('value')
+			cells.append(('A%d' %(r), key.encode('utf8')))
+			cells.append(('B%d' %(r), '\'%s' %(value.encode('utf8'))))
+			remValue = self.addParameterTableComment(cells, r, valueNode.get('label'))
+		elif (typeName == 'ParameterBoolean'):
+			value = valueNode.get('value')
+			cells.append(('A%d' %(r), key.encode('utf8')))
+			if (isinstance(value, bool)):
+				cells.append(('B%d' %(r), str(value)))
+			else:
+				cells.append(('B%d' %(r), value.encode('utf8')))
+			remValue = self.addParameterTableComment(cells, r, valueNode.get('label'))
+		else: #if (key.find('RDxVar') != 0):
+			value = valueNode
+			cells.append(('A%d' %(r), '%s' %(key.encode('utf8'))))
+			cells.append(('B%d' %(r), '%s' %(value.encode('utf8'))))
+			remValue = self.addParameterTableComment(cells, r, valueNode.get('label'))
+
+		if (key.find('RDxVar') != 0):
+			aliases.append(('B%d' %(r), '%s_' %(key.replace(':', '_'))))
+			logMessage(u'        A%d=\'%s\'; B%d=\'%s\'%s\'%s%s' %(r, key, r, value, mdlValue, tlrValue, remValue), LOG.LOG_DEBUG)
+			return r + 1
 		return r
 
 	def createParameterTable(self, partNode):
 		parameterRefs = partNode.get('parameters')
-		table = newObject(self.doc, 'Spreadsheet::Sheet', u'T_Parameters')
 		logMessage('    adding parameters table...', LOG.LOG_INFO)
-		table.set('A1', 'Parameter')
-		table.set('B1', 'Value')
-		table.set('C1', 'Fromula')
-		table.set('D1', 'Tolerance')
-		table.set('E1', 'Comment')
+
+		# 1st pass: order the parameters so that referenced ones come first
+		order = []
+		for key in parameterRefs.keys():
+			self.addParameterToOrder(order, [], parameterRefs, key)
+
+		# 2nd pass: build the table's content in memory ...
+		cells   = [('A1', 'Parameter'), ('B1', 'Value'), ('C1', 'Fromula'), ('D1', 'Tolerance'), ('E1', 'Comment')]
+		aliases = []
 		r = 2
-		keys = parameterRefs.keys()
-		for key in keys:
-			r = self.addParameterToTable(table, r, parameterRefs, key)
+		for key in order:
+			r = self.addParameterToTable(cells, aliases, r, parameterRefs, key)
+
+		# ... and write it in one go.
+		table = newObject(self.doc, 'Spreadsheet::Sheet', u'T_Parameters')
+		for cell, content in cells:
+			table.set(cell, content)
+		for cell, aliasValue in aliases:
+			try:
+				table.setAlias(cell, aliasValue.encode('utf8'))
+			except Exception as e:
+				logError(u'    >ERROR: Can\'t set alias name for %s - invalid name \'%s\' - %s!' %(cell, aliasValue, e))
+		table.recompute()
 		return
 
 	def importModel(self, model):
@@ -2841,6 +3191,8 @@ class FreeCADImporter:
 				for ref in lst:
 					self.getEntity(ref)
 				if (self.doc):
+					if (self.batchBooleans):
+						self.mergeBooleans()
 					self.doc.recompute()
 			else:
 				logWarning('>>>No content to be displayed<<<')
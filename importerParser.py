@@ -0,0 +1,243 @@
+# -*- coding: utf8 -*-
+
+'''
+importerParser.py:
+
+Reads the content of Autodesk (R) Invetor (R) files into the model - without
+FreeCAD. The parser can be used in plain python (e.g. for batch analysis):
+	setInventorFile(filename)
+	ReadFile(None, False)
+	# analyse importerReader.model
+For indexing only the iProperties, the file version and the thumbnail are
+required - ReadMetaData(filename) returns them without reading RSeStorage.
+'''
+
+import sys
+import os
+from olefile           import isOleFile, OleFileIO
+from importerUtils     import LOG, getInventorFile, setInventorFile, setFileVersion, getFileVersion, PrintableName, isEmbeddings, logMessage, logWarning, logError
+from importerProfiler  import *
+from importerReader    import *
+from importerDump      import flushDumps
+
+__author__      = 'Jens M. Plonka'
+__copyright__   = 'Copyright 2017, Germany'
+__version__     = '0.6.0'
+__status__      = 'In-Development'
+
+def ReadIgnorable(fname, data):
+	logMessage("\t>>> IGNORED: %r" % ('/'.join(fname)))
+	logMessage(HexAsciiDump(data), LOG.LOG_DEBUG)
+	return len(data)
+
+def skip(data):
+	return len(data)
+
+def ReadElement(ole, fname, doc, counter, readProperties):
+	end = 0
+
+	name = fname[-1]
+	if (len(fname) > 1):
+		parent = fname[-2]
+	else:
+		parent = ''
+	path = PrintableName(fname)
+	t0 = startTimer()
+	stream = ole.openstream(fname).read()
+	stopTimer(STAGE_STREAM, name, t0)
+
+	folder = getInventorFile()[0:-4]
+
+	if (len(stream)>0):
+#		if (name.startswith('\x01') or name.startswith('\x02') or name.startswith('\x05')):
+#			binFile = open ('%s\\%s.bin' %(folder, name[1:]), 'wb')
+#		else:
+#			binFile = open ('%s\\%s.bin' %(folder, name), 'wb')
+#			binFile.write(stream)
+#			binFile.close()
+
+		if (len(fname) == 1):
+			if (name.startswith('\x05')):
+				if (readProperties):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					if (name == '\x05Aaalpg0m0wzvuhc41dwauxbwJc'):
+						ReadInventorDocumentSummaryInformation(doc, ole.getproperties(fname, convert_time=True), fname)
+					elif (name == '\x05Zrxrt4arFafyu34gYa3l3ohgHg'):
+						ReadInventorSummaryInformation(doc, ole.getproperties(fname, convert_time=True), fname)
+					else:
+						ReadOtherProperties(ole.getproperties(fname, convert_time=True), fname)
+				end = len(stream)
+			elif (name == 'UFRxDoc'):
+				logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+				end = ReadUFRxDoc(stream)
+			elif (name == 'Protein'):
+				logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+				end = ReadProtein(stream)
+			else:
+				logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+				end = ReadIgnorable(fname, stream)
+		elif (fname[0]=='CacheGraphics'):
+			end = skip(stream)
+		elif (fname[0]=='RSeStorage'):
+			if (isEmbeddings(fname)):
+				if (name.startswith('\x05')):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					# ReadOtherProperties(ole.getproperties(fname, convert_time=True), fname)
+					end = skip(stream)
+				elif (name == '\x01Ole'):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+#					end = ReadRSeEmbeddingsOle(stream)
+					end = skip(stream)
+				elif (name == '\x01CompObj'):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					end = ReadRSeEmbeddingsCompObj(stream)
+				elif (name == 'DatabaseInterfaces'):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					end = ReadRSeEmbeddingsDatabaseInterfaces(stream)
+				elif (name == 'Contents'):
+#					end = ReadRSeEmbeddingsContents(stream)
+					end = skip(stream)
+				elif (name == 'Workbook'):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					end = ReadWorkbook(doc, stream, fname[-2], name)
+				else:
+					logMessage("%2d: %s" % (counter, path))
+					end = ReadIgnorable(fname, stream)
+			else:
+				if (name == 'RSeDb'):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					end = ReadRSeDb(stream)
+				elif (name == 'RSeSegInfo'):
+					logMessage("%2d: %s" % (counter, path))
+					if ((model) and (model.RSeDb) and (model.RSeDb.version == 0x1D)):
+						end = ReadRSeSegInfo1D(stream)
+					else:
+						end = ReadRSeSegInfo1F(stream)
+				elif (name == 'RSeDbRevisionInfo'):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					end = ReadRSeDbRevisionInfo(stream)
+				elif (name.startswith('B')):
+					# Skip! will be handled in 'M'
+					end = skip(stream)
+				elif (name.startswith('M')):
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					fnameB = []
+					for n in (fname):
+						fnameB.append(n)
+					fnameB[-1] = 'B' + name[1:]
+					seg, end = ReadRSeMetaDataM(stream, name[1:])
+					t0 = startTimer()
+					dataB = ole.openstream(fnameB).read()
+					stopTimer(STAGE_STREAM, fnameB[-1], t0)
+					ReadRSeMetaDataB(dataB, seg)
+				else:
+					logMessage("%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+					end = ReadIgnorable(fname, stream)
+		else:
+			logMessage("'%2d: %s" % (counter, path), LOG.LOG_DEBUG)
+			end = ReadIgnorable(fname, stream)
+
+	return
+
+def ListElement(ole, fname, counter):
+	name = fname[-1]
+
+	path = PrintableName(fname)
+	stream = ole.openstream(fname).read()
+	logMessage("%2d: %s size=%s" % (counter, path, len(stream)), LOG.LOG_ALWAYS)
+
+def ReadFile(doc, readProperties):
+	'''
+	Reads the Inventor file into the model. The document is optional (None for
+	parsing only) - it's only required for the iProperties and the comment.
+	'''
+	first = 0
+	list = {}
+	counters = {}
+
+	# LOG.LOG_FILTER = LOG.LOG_FILTER | LOG.LOG_DEBUG
+
+	if (isOleFile(getInventorFile())):
+		t0 = startTimer()
+		ole = OleFileIO(getInventorFile())
+		setFileVersion(ole)
+		elements = ole.listdir(streams=True, storages=False)
+		stopTimer(STAGE_OLE, 'open', t0)
+
+		folder = getInventorFile()[0:-4]
+		if not os.path.exists(folder):
+			os.makedirs(folder)
+
+		counter = 1
+		list = []
+		for fname in elements:
+			if (len(fname) == 1):
+				list.append(fname)
+			else:
+				#Ensure that RSe* files will be parsed first
+				if (fname[-1].startswith('RSe')):
+					#ensure RSeDb is the very first "file" to be parsed
+					list.insert(first, fname)
+					if (fname[-1] == 'RSeDb'):
+						first += 1
+				elif (not fname[-1].startswith('B')):
+					list.append(fname)
+
+		try:
+			for fname in list:
+				ReadElement(ole, fname, doc, counter, readProperties)
+				counter += 1
+			ole.close()
+		finally:
+			# write the dumps and report write errors even if reading failed
+			flushDumps()
+
+		if (doc):
+			now = datetime.datetime.now()
+			if (len(doc.Comment) > 0):
+				doc.Comment += '\n'
+			doc.Comment = '# %s: read from %s' %(now.strftime('%Y-%m-%d %H:%M:%S'), getInventorFile())
+
+		logMessage("Dumped data to folder: '%s'" %(getInventorFile()[0:-4]), LOG.LOG_INFO)
+
+		return True
+	logError("Error - '%s' is not a valid Autodesk Inventor file." %(getInventorFile()))
+	return False
+
+def ReadMetaData(filename, readThumbnail = True):
+	'''
+	Reads only the property sets ('\x05...' streams), the file version and the
+	thumbnail of an Inventor file - RSeStorage is never touched. Neither the model
+	nor the export folder is changed.
+	Returns a dict:
+		{'file': filename, 'version': 2015, 'iProperties': {name: {key: value}},
+		 'thumbnail': {'width': w, 'height': h, 'data': png} or None}
+	or None if the file is not an OLE file.
+	'''
+	if (not isOleFile(filename)):
+		logError("Error - '%s' is not a valid Autodesk Inventor file." %(filename))
+		return None
+
+	meta = {'file': filename, 'version': None, 'iProperties': {}, 'thumbnail': None}
+	ole = OleFileIO(filename)
+	try:
+		setFileVersion(ole)
+		meta['version'] = getFileVersion()
+		for fname in ole.listdir(streams=True, storages=False):
+			if ((len(fname) == 1) and (fname[0].startswith('\x05'))):
+				properties = ole.getproperties(fname, convert_time=True)
+				isSummary = (fname[0] == '\x05Zrxrt4arFafyu34gYa3l3ohgHg')
+				values = {}
+				for key in properties:
+					if ((key != KEY_CODEPAGE) and (key != KEY_SET_NAME) and (key != KEY_LANGUAGE_CODE)):
+						val = getProperty(properties, key)
+						if (isSummary and ((key == KEY_THUMBNAIL_1) or (key == KEY_THUMBNAIL_2))):
+							if (readThumbnail and (meta['thumbnail'] is None) and (len(val) > 0x10)):
+								thmb = getThumbnail(val)
+								meta['thumbnail'] = {'width': thmb.width, 'height': thmb.height, 'data': thmb.data}
+						else:
+							values[key] = val
+				meta['iProperties'][getPropertySetName(properties, fname)] = values
+	finally:
+		ole.close()
+	return meta
@@ -0,0 +1,131 @@
+# -*- coding: utf8 -*-
+
+'''
+importerProfiler.py:
+
+Collects timings and counters of the different import stages.
+When the profiler is disabled startTimer returns None and stopTimer returns
+immediately, so the hooks in the readers and the FreeCAD importer cost nearly
+nothing.
+'''
+
+import json
+from timeit import default_timer
+
+__author__      = 'Jens M. Plonka'
+__copyright__   = 'Copyright 2017, Germany'
+__version__     = '0.6.0'
+__status__      = 'In-Development'
+
+STAGE_OLE       = 'OLE'
+STAGE_STREAM    = 'Stream'
+STAGE_ZLIB      = 'zlib'
+STAGE_SEGMENT   = 'ReadSegmentData'
+STAGE_READ      = 'Read'
+STAGE_TREE      = 'buildTree'
+STAGE_CREATE    = 'Create'
+STAGE_SKETCH    = 'addSketch'
+STAGE_IMPORT    = 'Import'
+
+_enabled = False
+
+# (stage, name) -> [count, seconds]
+_stats   = {}
+
+def isProfiling():
+	global _enabled
+	return _enabled
+
+def setProfiling(enabled):
+	global _enabled
+	_enabled = enabled
+	return
+
+def resetProfiling():
+	global _stats
+	_stats = {}
+	return
+
+def startTimer():
+	if (_enabled):
+		return default_timer()
+	return None
+
+def stopTimer(stage, name, start):
+	'''
+	Adds the time elapsed since start to the statistic (stage, name).
+	Args:
+		stage
+			The import stage (e.g. STAGE_READ).
+		name
+			The item inside the stage, e.g. the node's type name.
+		start
+			The value returned by startTimer.
+	'''
+	if (start is not None):
+		key = (stage, name)
+		stat = _stats.get(key)
+		if (stat is None):
+			stat = [0, 0.0]
+			_stats[key] = stat
+		stat[0] += 1
+		stat[1] += default_timer() - start
+	return
+
+def addCounter(stage, name, count = 1):
+	if (_enabled):
+		key = (stage, name)
+		stat = _stats.get(key)
+		if (stat is None):
+			stat = [0, 0.0]
+			_stats[key] = stat
+		stat[0] += count
+	return
+
+def getReport():
+	'''
+	Returns the collected statistics as a plain dictionary:
+	{stage: {name: {'count': n, 'time': seconds}}}
+	'''
+	report = {}
+	for key in _stats:
+		stage, name = key
+		count, seconds = _stats[key]
+		if (stage not in report):
+			report[stage] = {}
+		report[stage][name] = {'count': count, 'time': seconds}
+	return report
+
+def getReportText():
+	'''
+	Returns the collected statistics as text table sorted by the consumed time.
+	The times of nested calls (e.g. Create_* of referenced features) are inclusive.
+	'''
+	lines = []
+	lines.append('%-16s %-48s %8s %12s %12s' %('Stage', 'Name', 'Count', 'Total [s]', 'Mean [ms]'))
+	lines.append('-' * 100)
+	keys = sorted(_stats.keys(), key=lambda k: _stats[k][1], reverse=True)
+	for key in keys:
+		stage, name = key
+		count, seconds = _stats[key]
+		mean = 0.0
+		if (count > 0): mean = seconds * 1000.0 / count
+		lines.append(u'%-16s %-48s %8d %12.4f %12.4f' %(stage, name, count, seconds, mean))
+	return u'\n'.join(lines)
+
+def writeReport(folder):
+	'''
+	Writes the report as 'Profile.json' and 'Profile.txt' into the given folder.
+	Returns the name of the text report.
+	'''
+	filename = '%s\\Profile.json' %(folder)
+	file = open(filename, 'wb')
+	json.dump(getReport(), file, indent=1, sort_keys=True)
+	file.close()
+
+	filename = '%s\\Profile.txt' %(folder)
+	file = open(filename, 'wb')
+	file.write(getReportText().encode('utf8'))
+	file.write('\n')
+	file.close()
+	return filename
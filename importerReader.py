@@ -18,20 +18,10 @@ import struct
 import codecs
 from importerClasses     import *
 from importerSegment     import SegmentReader
-from importerApp         import AppReader
-from importerBRep        import BRepReader
-from importerBrowser     import BrowserReader
-from importerDC          import DCReader
-from importerDesignView  import DesignViewReader
-from importerEeData      import EeDataReader
-from importerEeScene     import EeSceneReader
-from importerFBAttribute import FBAttributeReader
-from importerGraphics    import GraphicsReader
-from importerNotebook    import NotebookReader
-from importerResults     import ResultReader
 from importerUtils       import *
-import xlrd
-from xlutils.copy import copy
+from importerProfiler    import startTimer, stopTimer, STAGE_ZLIB, STAGE_SEGMENT
+from importerDump        import openDump, writeDump
+from StringIO            import StringIO
 
 __author__      = 'Jens M. Plonka'
 __copyright__   = 'Copyright 2017, Germany'
@@ -41,6 +31,14 @@ __status__      = 'In-Development'
 # The model representing the content of the imported file
 model = Inventor()
 
+def resetModel():
+	'''
+	Clears the model before another file is read (e.g. by the conversion server).
+	The instance is kept, as the importing modules hold references to it.
+	'''
+	model.__init__()
+	return
+
 KEY_SUM_INFO_AUTHOR      = 0x04
 KEY_SUM_INFO_COMMENT     = 0x06
 KEY_SUM_INFO_MODIFYER    = 0x08
@@ -92,10 +90,10 @@ def ReadInventorSummaryInformation(doc, properties, path):
 		if ((key != KEY_CODEPAGE) and (key != KEY_SET_NAME) and (key != KEY_LANGUAGE_CODE)):
 			val = getProperty(properties, key)
 			if (key == KEY_THUMBNAIL_1):
-				if (FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/InventorLoader").GetBool('Others.DumpThumpnails', False)):
+				if (getBoolPreference('Others.DumpThumpnails', False)):
 					val = writeThumbnail(val)
 			elif (key == KEY_THUMBNAIL_2):
-				if (FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/InventorLoader").GetBool('Others.DumpThumpnails', False)):
+				if (getBoolPreference('Others.DumpThumpnails', False)):
 					val = writeThumbnail(val)
 			model.iProperties[name][key] = val
 	return
@@ -280,13 +278,14 @@ def ReadProtein(data):
 	zip = data[4: size]
 
 	folder = getInventorFile()[0:-4]
-	protein = open ('%s\\Protein.zip' %(folder), 'wb')
-	protein.write(zip)
-	protein.close()
+	writeDump('%s\\Protein.zip' %(folder), zip, False)
 	# logMessage('\t>>>INFO: found protein - stored as \'%s\\%s\'!' %(folder, 'Protein.zip'), LOG_INFO)
 	return size + 4
 
 def ReadWorkbook(doc, data, name, stream):
+	import xlrd
+	from xlutils.copy import copy
+
 	##create a new Spreadsheet in new document
 	folder = getInventorFile()[0:-4]
 	filename = '%s\\%s.xls' %(folder, name)
@@ -309,7 +308,9 @@ def ReadWorkbook(doc, data, name, stream):
 		idx += 1
 
 	xls = copy(wbk)
-	xls.save(filename)
+	buffer = StringIO()
+	xls.save(buffer)
+	writeDump(filename, buffer.getvalue(), False)
 	# logMessage('>>>INFO - found workook: stored as %r!' %(filename), LOG.LOG_INFO)
 	return len(data)
 
@@ -786,17 +787,76 @@ def ReadRSeMetaDataSectionSizeArray(data, offset):
 	size, i = getUInt32(data, offset)
 	return i
 
+# The records of the sections are decoded in one go into columns (see
+# getRecordColumns). The RSeStorage* objects are created on first access by
+# the following functions - the index j is zero based!
+
+def newRSeStorageBlockSize(value, columns, j):
+	sec = RSeStorageBlockSize(value)
+	u32 = columns[0][j]
+	sec.length = (u32 & 0x7FFFFFFF)
+	sec.flags = ((u32 & 0x80000000) > 0)
+	return sec
+
+def newRSeStorageSection2(value, columns, j):
+	sec = RSeStorageSection2(value)
+	if (value.ver == 3):
+		sec.revisionRef, i = getUUID(columns[0][j], 0, '%s.Sec2[%X].uidRef' % (value.name, j + 1))
+	else:
+		sec.revisionRef = getRevisionRef(columns[0][j])
+	sec.flag = columns[1][j]
+	sec.val  = columns[2][j]
+	if (value.ver in (3, 4)):
+		sec.arr = [columns[k][j] for k in range(3, 8)]
+	return sec
+
+def newRSeStorageSection3(value, columns, j):
+	sec = RSeStorageSection3(value)
+	sec.uid, i = getUUID(columns[0][j], 0, '%s.Sec3[%X].uidRef' % (value.name, j + 1))
+	sec.arr = [columns[k][j] for k in range(1, 7)]
+	return sec
+
+def newRSeStorageSection4Data(num, val):
+	data = RSeStorageSection4Data()
+	data.num = num
+	data.val = val
+	return data
+
+def newRSeStorageBlockType(value, columns, j):
+	sec = RSeStorageBlockType(value)
+	sec.typeID, i = getUUID(columns[0][j], 0, '%s.Sec4[%X].uidRef' % (value.name, j))
+	sec.key  = sec.typeID.time_low
+	sec.name = '%08X' % (sec.key)
+	sec.arr.append(newRSeStorageSection4Data(columns[1][j], columns[2][j]))
+	sec.arr.append(newRSeStorageSection4Data(columns[3][j], columns[4][j]))
+	return sec
+
+def newRSeStorageSection8(value, columns, j):
+	sec = RSeStorageSection8(value)
+	sec.dbRevisionInfoRef, i = getUUID(columns[0][j], 0, '%s.Sec8[%X].dbRevisionInfoRef' % (value.name, j + 1))
+	sec.arr = [columns[1][j], columns[2][j]]
+	return sec
+
+def newRSeStorageSection9(value, columns, j):
+	sec = RSeStorageSection9(value)
+	sec.uid, i = getUUID(columns[0][j], 0, '%s.Sec9[%X].uidRef' % (value.name, j + 1))
+	sec.arr = [columns[1][j], columns[2][j], columns[3][j]]
+	return sec
+
+def newRSeStorageSectionA(value, columns, j):
+	sec = RSeStorageSectionA(value)
+	sec.arr = [columns[k][j] for k in range(0, 4)]
+	return sec
+
+def newRSeStorageSectionB(value, columns, j):
+	sec = RSeStorageSectionB(value)
+	sec.arr = [columns[0][j], columns[1][j]]
+	return sec
+
 def ReadRSeMetaDataBlocksSize(value, data, offset):
 	cnt, i = getUInt32(data, offset)
-	j = 0
-	while (j < cnt):
-		j += 1
-		sec = RSeStorageBlockSize(value)
-		u32, i = getUInt32(data, i)
-		sec.length = (u32 & 0x7FFFFFFF)
-		sec.flags = ((u32 & 0x80000000) > 0)
-
-		value.sec1.append(sec)
+	columns, i = getRecordColumns(data, i, 'L', cnt)
+	value.sec1 = RSeRecordArray(value, columns, newRSeStorageBlockSize)
 
 	i = ReadRSeMetaDataSectionSizeArray(data, i)
 
@@ -804,61 +864,28 @@ def ReadRSeMetaDataBlocksSize(value, data, offset):
 
 def ReadRSeMetaDataSection2(value, data, offset):
 	cnt, i = getUInt32(data, offset)
-	j = 0
-	while (j < cnt):
-		j += 1
-		sec = RSeStorageSection2(value)
-		if (value.ver == 3):
-			sec.revisionRef, i = getUUID(data, i, '%s.Sec2[%X].uidRef' % (value.name, j))
-			sec.flag, i = getUInt32(data, i)
-			sec.val, i = getUInt16(data, i)
-			sec.arr, i = getUInt16A(data, i, 5)
-		elif (value.ver == 4):
-			idx, i = getUInt32(data, i)
-			sec.revisionRef = getRevisionRef(idx)
-			sec.flag, i = getUInt32(data, i)
-			sec.val, i = getUInt16(data, i)
-			sec.arr, i = getUInt16A(data, i, 5)
-		else:
-			idx, i = getUInt32(data, i)
-			sec.revisionRef = getRevisionRef(idx)
-			sec.flag, i = getUInt32(data, i)
-			sec.val, i = getUInt16(data, i)
-		value.sec2.append(sec)
+	if (value.ver == 3):
+		fmt = '16sLH5H'
+	elif (value.ver == 4):
+		fmt = 'LLH5H'
+	else:
+		fmt = 'LLH'
+	columns, i = getRecordColumns(data, i, fmt, cnt)
+	value.sec2 = RSeRecordArray(value, columns, newRSeStorageSection2)
 	i = ReadRSeMetaDataSectionSizeArray(data, i)
 	return i
 
 def ReadRSeMetaDataSection3(value, data, offset):
 	cnt, i = getUInt32(data, offset)
-	j = 0
-	while (j < cnt):
-		j += 1
-		sec = RSeStorageSection3(value)
-		sec.uid, i = getUUID(data, i, '%s.Sec3[%X].uidRef' % (value.name, j))
-		sec.arr, i = getUInt16A(data, i, 6)
-		value.sec3.append(sec)
+	columns, i = getRecordColumns(data, i, '16s6H', cnt)
+	value.sec3 = RSeRecordArray(value, columns, newRSeStorageSection3)
 	i = ReadRSeMetaDataSectionSizeArray(data, i)
 	return i
 
-def ReadRSeMetaDataSection4Data(data, offset):
-	val = RSeStorageSection4Data()
-	val.num, i = getUInt16(data, offset)
-	val.val, i = getUInt32(data, i)
-	return val, i
-
 def ReadRSeMetaDataBlocksType(value, data, offset):
 	cnt, i = getUInt32(data, offset)
-	j = 0
-	while (j < cnt):
-		sec = RSeStorageBlockType(value)
-		uid, i = getUUID(data, i, '%s.Sec4[%X].uidRef' % (value.name, j))
-		sec.typeID = uid
-		val, i = ReadRSeMetaDataSection4Data(data, i)
-		sec.arr.append(val)
-		val, i = ReadRSeMetaDataSection4Data(data, i)
-		sec.arr.append(val)
-		value.sec4[j] = sec
-		j += 1
+	columns, i = getRecordColumns(data, i, '16sHLHL', cnt)
+	value.sec4 = RSeRecordArray(value, columns, newRSeStorageBlockType)
 	i = ReadRSeMetaDataSectionSizeArray(data, i)
 
 	return i
@@ -945,26 +972,14 @@ def ReadRSeMetaDataSection7(value, data, offset, size, cnt):
 	return i
 
 def ReadRSeMetaDataSection8(value, data, offset, size, cnt):
-	i = offset
-	j = 0
-	while (j < cnt):
-		j += 1
-		sec = RSeStorageSection8(value)
-		sec.dbRevisionInfoRef, i = getUUID(data, i, '%s.Sec8[%X].dbRevisionInfoRef' % (value.name, j))
-		sec.arr, i = getUInt16A(data, i, 2)
-		value.sec8.append(sec)
+	columns, i = getRecordColumns(data, offset, '16s2H', cnt)
+	value.sec8 = RSeRecordArray(value, columns, newRSeStorageSection8)
 	i = ReadRSeMetaDataSectionSizeArray(data, i)
 	return i
 
 def ReadRSeMetaDataSection9(value, data, offset, size, cnt):
-	i = offset
-	j = 0
-	while (j<cnt):
-		j += 1
-		sec = RSeStorageSection9(value)
-		sec.uid, i = getUUID(data, i, '%s.Sec9[%X].uidRef' % (value.name, j))
-		sec.arr, i = getUInt8A(data, i, 3)
-		value.sec9.append(sec)
+	columns, i = getRecordColumns(data, offset, '16s3B', cnt)
+	value.sec9 = RSeRecordArray(value, columns, newRSeStorageSection9)
 	i = ReadRSeMetaDataSectionSizeArray(data, i)
 	return i
 
@@ -972,24 +987,14 @@ def ReadRSeMetaDataSectionA(value, data, offset, size, cnt):
 	'''
 	Same values as in RSeSegmentType
 	'''
-	i = offset
-	j = 0
-	while (j<cnt):
-		j += 1
-		sec = RSeStorageSectionA(value)
-		sec.arr, i = getUInt16A(data, i, 4)
-		value.secA.append(sec)
+	columns, i = getRecordColumns(data, offset, '4H', cnt)
+	value.secA = RSeRecordArray(value, columns, newRSeStorageSectionA)
 	i = ReadRSeMetaDataSectionSizeArray(data, i)
 	return i
 
 def ReadRSeMetaDataSectionB(value, data, offset, size, cnt):
-	i = offset
-	j = 0
-	while (j<cnt):
-		j += 1
-		sec = RSeStorageSectionB(value)
-		sec.arr, i = getUInt16A(data, i, 2)
-		value.secB.append(sec)
+	columns, i = getRecordColumns(data, offset, '2H', cnt)
+	value.secB = RSeRecordArray(value, columns, newRSeStorageSectionB)
 	return i
 
 def findSegment(segRef):
@@ -1001,43 +1006,49 @@ def findSegment(segRef):
 
 	return None
 
+def newReader(module, name):
+	'''
+	Creates the segment reader - the reader's module is imported on first use.
+	'''
+	return getattr(__import__(module), name)()
+
 def getReader(seg):
 	reader = None
 	if (RSeMetaData.isApp(seg)):
 		pass
-		# reader = AppReader()
+		# reader = newReader('importerApp', 'AppReader')
 	elif (RSeMetaData.isBRep(seg)):
 		# Skip reading Browser Repository data
 		pass
-		# reader = BRepReader()
+		# reader = newReader('importerBRep', 'BRepReader')
 	elif (RSeMetaData.isBrowser(seg)):
 		pass
-		# reader = BrowserReader()
+		# reader = newReader('importerBrowser', 'BrowserReader')
 	elif (RSeMetaData.isDefault(seg)):
 		pass
 	elif (RSeMetaData.isDC(seg)):
-		reader = DCReader()
+		reader = newReader('importerDC', 'DCReader')
 	elif (RSeMetaData.isGraphics(seg)):
 		pass
-		# reader = GraphicsReader()
+		# reader = newReader('importerGraphics', 'GraphicsReader')
 	elif (RSeMetaData.isResult(seg)):
 		pass
-		# reader = ResultReader()
+		# reader = newReader('importerResults', 'ResultReader')
 	elif (RSeMetaData.isDesignView(seg)):
 		pass
-		# reader = DesignViewReader()
+		# reader = newReader('importerDesignView', 'DesignViewReader')
 	elif (RSeMetaData.isEeData(seg)):
 		pass
-		# reader = EeDataReader()
+		# reader = newReader('importerEeData', 'EeDataReader')
 	elif (RSeMetaData.isEeScene(seg)):
 		pass
-		# reader = EeSceneReader()
+		# reader = newReader('importerEeScene', 'EeSceneReader')
 	elif (RSeMetaData.isFBAttribute(seg)):
 		pass
-		# reader = FBAttributeReader()
+		# reader = newReader('importerFBAttribute', 'FBAttributeReader')
 	elif (RSeMetaData.isNBNotebook(seg)):
 		pass
-		# reader = NotebookReader()
+		# reader = newReader('importerNotebook', 'NotebookReader')
 	elif (seg.segRef is not None):
 		logWarning('>W: %s will be read, but not considered!' %(seg.name))
 	return reader
@@ -1048,18 +1059,23 @@ def ReadRSeMetaDataB(dataB, seg):
 		folder = getInventorFile()[0:-4]
 
 		filename = '%s\\%sB.log' %(folder, seg.name)
-		newFile = codecs.open(filename, 'wb', 'utf8')
-
-		newFile.write('[%s]\n' %(getFileVersion()))
-		i = 0
-		uid, i = getUUID(dataB, i, '%sB.uid' %(seg.name))
-		n, i = getUInt16(dataB, i)
-		z = zlib.decompressobj()
-		data = z.decompress(dataB[i:])
-
-		reader.ReadSegmentData(newFile, data, seg)
-
-		newFile.close()
+		newFile = openDump(filename)
+		try:
+			newFile.write('[%s]\n' %(getFileVersion()))
+			i = 0
+			uid, i = getUUID(dataB, i, '%sB.uid' %(seg.name))
+			n, i = getUInt16(dataB, i)
+			t0 = startTimer()
+			z = zlib.decompressobj()
+			data = z.decompress(dataB[i:])
+			stopTimer(STAGE_ZLIB, '%sB' %(seg.name), t0)
+
+			t0 = startTimer()
+			reader.ReadSegmentData(newFile, data, seg)
+			stopTimer(STAGE_SEGMENT, seg.name, t0)
+		finally:
+			# keep the log written so far - especially if reading failed
+			newFile.close()
 
 	return len(dataB)
 
@@ -1100,8 +1116,10 @@ def ReadRSeMetaDataM(dataM, name):
 	# dataM[i] should always be '\0x01' !!!
 	x01, i = getUInt8(dataM, i)
 
+	t0 = startTimer()
 	z = zlib.decompressobj()
 	data = z.decompress(dataM[i:])
+	stopTimer(STAGE_ZLIB, '%sM' %(value.name), t0)
 	bak = getDumpLineLength()
 	setDumpLineLength(0x30)
 
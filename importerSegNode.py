@@ -95,6 +95,7 @@ class AbstractNode(AbstractData):
 
 	def __init__(self):
 		AbstractData.__init__(self)
+		self.keepData = False # the raw data is still required after the tree is built (e.g. not completely decoded)
 
 	def ReadUInt8(self, offset, name):
 		x, i = getUInt8(self.data, offset)
@@ -248,6 +249,7 @@ class AbstractNode(AbstractData):
 		u16_0, i = getUInt16(self.data, offset)
 		u16_1, i = getUInt16(self.data, i)
 		ref = NodeRef(u16_0, u16_1, type)
+		ref.offset = offset
 
 		self.set(name, None)
 
@@ -753,16 +755,36 @@ class AbstractNode(AbstractData):
 		self.typeID = UUID(uid)
 		self.typeName = '%08X' %(self.typeID.time_low)
 
-	def getUnitOffset(self):
+	def getUnit(self):
+		'''
+		Returns the unit of this node as tuple (name, derived name, factor, offset).
+		The result is cached in the unit node, so the numerators and
+		denominators are resolved only once for all nodes sharing the unit.
+		'''
 		unitRef = self.get('refUnit')
 		if (unitRef):
-			numerators = unitRef.get('numerators')
-			if (numerators):
-				offset = numerators[0].get('UnitOffset')
-				if (offset is not None):
-					return offset
+			unit = unitRef.data
+			if (unit is not None):
+				if (unit.compiled is None):
+					unit.compiled = {}
+				resolved = unit.compiled.get('unit')
+				if (resolved is None):
+					resolved = (self.resolveUnitName(unitRef), self.resolveDerivedUnitName(unitRef), self.resolveUnitFactor(unitRef), self.resolveUnitOffset(unitRef))
+					unit.compiled['unit'] = resolved
+				return resolved
+		return (u'', None, 1.0, 0.0)
+
+	def resolveUnitOffset(self, unitRef):
+		numerators = unitRef.get('numerators')
+		if (numerators):
+			offset = numerators[0].get('UnitOffset')
+			if (offset is not None):
+				return offset
 		return 0.0
 
+	def getUnitOffset(self):
+		return self.getUnit()[3]
+
 	def getUnitFactors(self, units):
 		factor = 1.0
 		j      = 0
@@ -784,21 +806,21 @@ class AbstractNode(AbstractData):
 
 		return factor
 
-	def getUnitFactor(self):
-		factor = 1.0
-		unitRef = self.get('refUnit')
-		if (unitRef):
-			numerators = self.getUnitFactors(unitRef.get('numerators'))
-			denominators = self.getUnitFactors(unitRef.get('denominators'))
-			factor = numerators / denominators
-
-			derivedRef = unitRef.get('refDerived')
-			if (derivedRef):
-				numerators = self.getUnitFactors(derivedRef.get('numerators'))
-				denominators = self.getUnitFactors(derivedRef.get('denominators'))
-				factor = factor * numerators / denominators
+	def resolveUnitFactor(self, unitRef):
+		numerators = self.getUnitFactors(unitRef.get('numerators'))
+		denominators = self.getUnitFactors(unitRef.get('denominators'))
+		factor = numerators / denominators
+
+		derivedRef = unitRef.get('refDerived')
+		if (derivedRef):
+			numerators = self.getUnitFactors(derivedRef.get('numerators'))
+			denominators = self.getUnitFactors(derivedRef.get('denominators'))
+			factor = factor * numerators / denominators
 		return factor
 
+	def getUnitFactor(self):
+		return self.getUnit()[2]
+
 	def getUnitFormula(self, units): # return unicode
 		formula = u''
 		sep     = ''
@@ -851,6 +873,19 @@ class AbstractNode(AbstractData):
 				formula = u'%s%s%s' %(formula, sep, subformula)
 		return formula
 
+	def resolveUnitName(self, unitRef): # return unicode
+		unitName     = self.getUnitFormula(unitRef.get('numerators'))
+		denominators = self.getUnitFormula(unitRef.get('denominators'))
+		if (len(denominators) > 0):
+			unitName += '/' + denominators
+		return unitName
+
+	def resolveDerivedUnitName(self, unitRef):
+		derived = unitRef.get('refDerived')
+		if (derived):
+			return self.resolveUnitName(derived)
+		return None
+
 	def getUnitName(self): # return unicode
 		'''
 		TODO:
@@ -858,28 +893,10 @@ class AbstractNode(AbstractData):
 		Add a new derived unit! But how?
 		Meanwhile the derived units are ignored!
 		'''
-		unit  = self.get('refUnit')
-		unitName = u''
-		if (unit):
-			unitName     = self.getUnitFormula(unit.get('numerators'))
-			denominators = self.getUnitFormula(unit.get('denominators'))
-			if (len(denominators) > 0):
-				unitName += '/' + denominators
-
-		return unitName
+		return self.getUnit()[0]
 
 	def getDerivedUnitName(self):
-		unit = self.get('refUnit')
-		if (unit):
-			derived = unit.get('refDerived')
-			if (derived):
-				unitName     = self.getUnitFormula(derived.get('numerators'))
-				denominators = self.getUnitFormula(derived.get('denominators'))
-				if (len(denominators) > 0):
-					unitName += '/' + denominators
-
-				return unitName
-		return None
+		return self.getUnit()[1]
 
 class AppNode(AbstractNode):
 	def __init__(self):
@@ -941,6 +958,7 @@ class NodeRef():
 		self.mask   = (m & 0x8000) >> 15
 		self.type   = refType
 		self.number = 0
+		self.offset = -1 # position of the reference inside the node's data
 		self._data  = None
 
 	@property
@@ -11,6 +11,8 @@ import traceback
 from importerClasses   import *
 from importerSegNode   import BinaryNode, isList, NodeRef
 from importerUtils     import *
+from importerProfiler  import startTimer, stopTimer, STAGE_READ, STAGE_TREE
+from importerDump      import writeDump
 
 __author__      = 'Jens M. Plonka'
 __copyright__   = 'Copyright 2017, Germany'
@@ -35,10 +37,12 @@ def dumpData(file, data, offset, end):
 			file.write('\t[%s]\n' %(IntArr2Str(arr8, 2)))
 	return
 
+def getBlockType(index, seg):
+	assert (index < len(seg.sec4)), "Index %X not defined in segment's section No.4!" %(index)
+	return seg.sec4[index]
+
 def getNodeType(index, seg):
-	assert (index in seg.sec4), "Index %X not defined in segment's section No.4!" %(index)
-	blockType = seg.sec4[index]
-	return blockType.typeID
+	return getBlockType(index, seg).typeID
 
 def getStart(m, data, offset):
 	if (m):
@@ -292,12 +296,14 @@ class SegmentReader(object):
 		self.nodeCounter = 0
 		self.analyseLists = analyseLists
 		self.fmt_old = (getFileVersion() < 2011)
+		self.releaseData = getBoolPreference('Others.ReleaseNodeData', False)
 
 	def createNewNode(self):
 		return BinaryNode()
 
 	def ReadUnknown(self, node, block, file, logError = False, analyseLists = True):
 		l = len(block)
+		node.keepData = True
 
 		if (l > 0):
 			i = 0
@@ -342,16 +348,25 @@ class SegmentReader(object):
 
 	def HandleBlock(self, file, node):
 		i = 0
+		typeName = node.typeName
+		t0 = startTimer()
 
 		try:
-			readType = getattr(self, 'Read_%s' %(node.typeName))
-			i = readType(node)
+			blockType = node.blockType
+			if (blockType.reader is None):
+				blockType.reader = getattr(self, 'Read_%s' %(typeName))
+			i = blockType.reader(node)
 		except Exception as e:
+			node.keepData = True
 			logError('ERROR> (%04X): %s - %s' %(node.index, node.typeName, e))
 			logError('>E: ' + traceback.format_exc())
 
+		stopTimer(STAGE_READ, typeName, t0)
+
 		try:
-			if (i < len(node.data)): i = node.ReadUInt8A(i, len(node.data) - i, '\taX')
+			if (i < len(node.data)):
+				node.keepData = True
+				i = node.ReadUInt8A(i, len(node.data) - i, '\taX')
 		except:
 			logError('>ERROR in %s.Read_%s: %s' %(self.__class__.__name__, node.typeName, traceback.format_exc()))
 
@@ -360,11 +375,9 @@ class SegmentReader(object):
 	def setNodeData(self, node, data):
 		offset = node.offset
 		nodeTypeID, i = getUInt8(data, offset - 4)
-		node.typeID = getNodeType(nodeTypeID, node.seg)
-		if (isinstance(node.typeID, UUID)):
-			node.typeName = '%08X' % (node.typeID.time_low)
-		else:
-			node.typeName = '%08X' % (node.typeID)
+		node.blockType = getBlockType(nodeTypeID, node.segment)
+		node.typeID    = node.blockType.typeID
+		node.typeName  = node.blockType.name
 		node.data = data[offset:offset + node.size]
 
 	def newNode(self, size, offset, data, seg):
@@ -394,11 +407,20 @@ class SegmentReader(object):
 			i += 4
 		return i
 
+	def releaseNodeData(self, seg):
+		'''
+		Drops the raw data of the segment's nodes - except for those not completely decoded.
+		'''
+		nodes = seg.elementNodes
+		for index in nodes:
+			node = nodes[index]
+			if (not node.keepData):
+				node.data = None
+		return
+
 	def dumpRawData(self, seg, data):
 		filename = '%s\\%sB.bin' %(getInventorFile()[0:-4], seg.name)
-		newFileRaw = open (filename, 'wb')
-		newFileRaw.write(data)
-		newFileRaw.close()
+		writeDump(filename, data)
 		return
 
 	def ReadSegmentData(self, file, buffer, seg):
@@ -419,9 +441,9 @@ class SegmentReader(object):
 
 			seg.elementNodes = {}
 			seg.indexNodes   = {}
-			for sec in seg.sec1:
-				if (sec.flags == 1):
-					l = sec.length
+			for u32 in seg.sec1.getColumn(0):
+				if (u32 & 0x80000000):
+					l = u32 & 0x7FFFFFFF
 					start = i - 4
 					data = self.ReadBlock(file, buffer, i, l, seg)
 					i += data.size
@@ -433,7 +455,11 @@ class SegmentReader(object):
 
 		finally:
 			if (showTree):
+				t0 = startTimer()
 				tree = buildTree(file, seg)
 				seg.tree = tree
+				stopTimer(STAGE_TREE, seg.name, t0)
+				if (self.releaseData):
+					self.releaseNodeData(seg)
 
 		return
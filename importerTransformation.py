@@ -7,8 +7,7 @@ Simple approach to read/analyse Autodesk (R) Invetor (R) part file's (IPT) brows
 The importer can read files from Autodesk (R) Invetor (R) Inventro V2010 on. Older versions will fail!
 TODO:
 '''
-from importerUtils import getFloat64, getUInt32, getUInt16, FloatArr2Str, logError
-from FreeCAD         import Rotation, Vector, Matrix
+from importerUtils import getFloat64A, getUInt32, getUInt16, FloatArr2Str, logError
 import math
 
 __author__      = 'Jens M. Plonka'
@@ -16,10 +15,41 @@ __copyright__   = 'Copyright 2017, Germany'
 __version__     = '0.4.0'
 __status__      = 'In-Development'
 
+# The matrix slots for the masks of the transformations: {(d1, d2): (slots, count)}
+_maskSlots = {}
+
+def getMaskSlots(d1, d2):
+	'''
+	Returns the content of the 16 matrix slots (row by row) for the masks - the
+	constant value or None if the value is stored - and the number of stored values.
+	'''
+	key = (d1, d2)
+	entry = _maskSlots.get(key)
+	if (entry is None):
+		slots = []
+		j = 0
+		while (j < 16):
+			b = (1 << j)
+			if (d2 & b == 0):
+				if (d1 & b == 0):
+					slots.append(None)
+				else:
+					slots.append(1)
+			else:
+				if (d1 & b == 0):
+					slots.append(0)
+				else:
+					slots.append(-1)
+			j += 1
+		entry = (tuple(slots), 16 - bin(d1 | d2).count('1'))
+		_maskSlots[key] = entry
+	return entry
+
 class Transformation:
 	def __init__(self):
 		self.a0 = 0x00000000
 		self.a1 = []
+		self.placement = None # created on demand by the importer
 
 	def read(self, data, offset):
 		#             +---- Value for the 4. row to be used for the transformation matrix
@@ -37,34 +67,19 @@ class Transformation:
 		#             vvvv
 		d2, i = getUInt16(data, i)
 		self.a0 = d1 | (d2 << 16)
-		n = 16 - bin(d1 | d2).count('1')
+		slots, n = getMaskSlots(d1, d2)
+		values, i = getFloat64A(data, i, n)
 		self.m = [[1,0,0,0],[0,1,0,0],[0,0,1,0],[0,0,0,1]]
 		j = 0
-		r = 0
-		c = 0
-		v = self.m[0]
+		k = 0
 		while (j < 16):
-			b = (1 << j)
-			if (d2 & b == 0):
-				if (d1 & b == 0):
-					v[c], i = getFloat64(data, i)
-					if (math.fabs(v[c]) < 0.00001): v[c] = 0.0
-				else:
-					v[c] = 1
-			else:
-				if (d1 & b == 0):
-					v[c] = 0
-				else:
-					v[c] = -1
-
+			v = slots[j]
+			if (v is None):
+				v = values[k]
+				if (math.fabs(v) < 0.00001): v = 0.0
+				k += 1
+			self.m[j >> 2][j & 3] = v
 			j += 1
-			if ((j % 4) == 0):
-				c = 0
-				r += 1
-				if (r < 4):
-					v = self.m[r]
-			else:
-				c += 1
 		return i
 
 	def getX(self):
@@ -108,13 +123,16 @@ class Transformation:
 		return u' transformation={a0=%s m=[%s]}' %(mask, m)
 
 	def getBase(self):
-		x = self.m[0, 3]
-		y = self.m[1, 3]
-		z = self.m[2, 3]
-		return Vector(x, y, z)
+		'''
+		Returns the translation as (x, y, z) tuple.
+		'''
+		x = self.m[0][3]
+		y = self.m[1][3]
+		z = self.m[2][3]
+		return (x, y, z)
 
 	def getRotation(self):
-		"""Return quaternion from the transformation matrix.
+		"""Return quaternion (x, y, z, w) from the transformation matrix.
 		"""
 		# the trace is the sum of the diagonal elements; see http://mathworld.wolfram.com/MatrixTrace.html
 		xx = self.m[0][0]
@@ -157,11 +175,14 @@ class Transformation:
 			x = (xz + zx) * s
 			y = (zy + yz) * s
 			w = (yx - xy) * s
-		return Rotation(x, y, z, w)
+		return (x, y, z, w)
 
 	def getMatrix(self):
+		'''
+		Returns the 16 values of the matrix (row by row) as tuple - e.g. for FreeCAD.Matrix(*values).
+		'''
 		m = self.m
-		return Matrix(                              \
+		return (                                    \
 			m[0][0], m[0][1], m[0][2], m[0][3], \
 			m[1][0], m[1][1], m[1][2], m[1][3], \
 			m[2][0], m[2][1], m[2][2], m[2][3], \
@@ -7,10 +7,10 @@ Collection of functions necessary to read and analyse Autodesk (R) Invetor (R) f
 '''
 
 import sys
+import os
 import datetime
-import FreeCAD
 from uuid    import UUID
-from struct  import pack, unpack
+from struct  import pack, unpack, unpack_from, calcsize
 from math    import fabs
 
 __author__      = 'Jens M. Plonka'
@@ -194,6 +194,36 @@ def getUInt32A(data, offset, size):
 	val = list(val)
 	return val, end
 
+def getRecordColumns(data, offset, fmt, count):
+	'''
+	Returns the values of consecutive fixed size records column by column.
+	Args:
+		data
+			A binary string.
+		offset
+			The zero based offset of the first record.
+		fmt
+			The struct format of a single record without byte order (e.g. '16sIH').
+		count
+			The number of records.
+	Returns:
+		The list of columns - one tuple with the values of all records per field.
+		The new position in the 'stream'.
+	'''
+	size = calcsize('<' + fmt)
+	end = offset + size * count
+	assert end <= len(data), "Trying to read %d records beyond data end (%s, %X > %X)" %(count, fmt, end, len(data))
+	fields = len(unpack('<' + fmt, b'\x00' * size))
+	if (count == 0):
+		return [()] * fields, end
+	val = unpack_from('<' + fmt * count, data, offset)
+	columns = []
+	k = 0
+	while (k < fields):
+		columns.append(val[k::fields])
+		k += 1
+	return columns, end
+
 def getSInt32(data, offset):
 	'''
 	Returns a single singned 32-Bit value.
@@ -398,69 +428,108 @@ def getLen32Text16(data, offset):
 		txt = txt[:-1]
 	return txt, end
 
+# The names of the known UUIDs. The key is the 128-bit integer value of the UUID
+# (UUID.int), so that the lookup doesn't need to format the UUID.
+_uuidNames = {}
+
+def getUUIDKey(uid):
+	if (isinstance(uid, UUID)):
+		return uid.int
+	if (isinstance(uid, (int, long))):
+		return uid
+	return UUID(uid).int
+
+def registerUUIDName(uid, name):
+	'''
+	Registers the name of a UUID. The uid can be given as UUID, as string or as integer value.
+	'''
+	global _uuidNames
+	_uuidNames[getUUIDKey(uid)] = name
+	return
+
+def getUUIDName(uid, default = None):
+	'''
+	Returns the registered name of the UUID - or the default if the name is unknown.
+	'''
+	global _uuidNames
+	if (isinstance(uid, UUID)):
+		return _uuidNames.get(uid.int, default)
+	return default
+
+def loadUUIDNames(filename):
+	'''
+	Adds the names of a data file to the UUID registry.
+	Each line contains the UUID and its name separated by whitespaces, '#' starts a comment.
+	Returns the number of names read.
+	'''
+	count = 0
+	n = 0
+	file = open(filename, 'r')
+	for line in file:
+		n += 1
+		line = line.split('#')[0].strip()
+		if (len(line) > 0):
+			try:
+				uid, name = line.split(None, 1)
+				registerUUIDName(uid, name.strip())
+				count += 1
+			except Exception as e:
+				logWarning('>W: %s line %d: invalid UUID name \'%s\' - %s!' %(filename, n, line, e))
+	file.close()
+	return count
+
+for uid, name in [
+	('90874d1611d0d1f80008cabc0663dc09', 'RDxPart'),
+	('ce52df4211d0d2d00008ccbc0663dc09', 'RDxPlane'),
+	('8ef06c8911d1043c60007cb801f31bb0', 'RDxLine3'),
+	('ce52df3e11d0d2d00008ccbc0663dc09', 'RDxPoint3'),
+	('90874d4711d0d1f80008cabc0663dc09', 'RDxBody'),
+	('90874d1111d0d1f80008cabc0663dc09', 'RDxPlanarSketch'),
+	('ce52df3b11d0d2d00008ccbc0663dc09', 'RDxArc2'),
+	('74df96e011d1e069800066b1e13554c7', 'RDxDiameter2'),
+	('ce52df3511d0d2d00008ccbc0663dc09', 'RDxPoint2'),
+	('ce52df3a11d0d2d00008ccbc0663dc09', 'RDxLine2'),
+	('1105855811d295e360000cb38932edb0', 'RDxDistanceDimension2'),
+	('00acc00011d1e05f800066b1e13554c7', 'RDxHorizontalDistance2'),
+	('3683ff4011d1e05f800066b1e13554c7', 'RDxVerticalDistance2'),
+	('90874d9111d0d1f80008cabc0663dc09', 'RDxFeature'),
+	('2067324411d21dc560002aab01f31bb0', 'RDxRectangularPattern'),
+	('fad9a9b511d2330560002cab01f31bb0', 'RDxMirrorPattern'),
+	('6759d86f11d27838600094b70b02ecb0', 'FWxRenderingStyle'),
+	('f645595c11d51333100060a6bba647b5', 'MIxTransactablePartition'),
+	('cc0f752111d18027e38619962259017a', 'RSeAcisEntityWrapper'),
+	('26287e9611d490bd1000e2962dba09b5', 'RDxDeselTableNode'),
+	('2d86fc2642dfe34030c08ab05ef9bfc5', 'RDxReferenceEdgeLoopId'),
+	('8f41fd2411d26eac00082aab32a3dc09', 'RDxStopNode'),
+	('2b24130911d272cc60007bb79b49ebb0', 'RDxBrowserFolder'),
+	('3c95b7ce11d13388000820a5b17adc09', 'NBxNotebook'),
+	('d81cde4711d265f760005dbead9287b0', 'NBxEntry'),
+	('671bb70011d1e068800066b1e13554c7', 'RDxRadius2'),
+	('590d0a1011d1e6ca80006fb1e13554c7', 'RDxAngle2'),
+	('1fbb3c0111d2684da0009e9a3c3aa076', 'RDxString'),
+	('ca7163a111d0d3b20008bfbb21eddc09', 'UCxComponentNode'),
+	('14533d8211d1087100085ba406e5dc09', 'UCxWorkplaneNode'),
+	('2c7020f611d1b3c06000b1b801f31bb0', 'UCxWorkaxisNode'),
+	('2c7020f811d1b3c06000b1b801f31bb0', 'UCxWorkpointNode'),
+	('9a676a5011d45da66000e3b81269f1b0', 'PMxBodyNode'),
+	('da58aa0e11d43cb1c000ae967a14684f', 'SCx3dSketchNode'),
+	('60fd184511d0d79d0008bfbb21eddc09', 'SCx2dSketchNode'),
+	('a94779e011d438066000b1b7b035f1b0', 'PMxSingleFeatureOutline'),
+	('a94779e111d438066000b1b7b035f1b0', 'PMxPatternOutline'),
+	('022ac1b511d20d356000f99ac5361ab0', 'PMxPartDrawAttr'),
+	('af48560f11d48dc71000d58dc04a0ab5', 'PMxColorStylePrimAttr'),
+	('452121b611d514d6100061a6bba647b5', 'RDxModelerTxnMgr'),
+	('b251bfc011d24761a0001580d694c7c9', 'PMxEntryManager'),
+	('21e870bb11d0d2d000d8ccbc0663dc09', 'BRxEntry'),
+	('dbbad87b11d228b0600052bead9287b0', 'NBxItem'),
+]:
+	registerUUIDName(uid, name)
+
 def getText1(uid):
-	b = uid.hex
-
-	if (b == '90874d1611d0d1f80008cabc0663dc09'): return 'RDxPart'
-	if (b == 'ce52df4211d0d2d00008ccbc0663dc09'): return 'RDxPlane'
-	if (b == '8ef06c8911d1043c60007cb801f31bb0'): return 'RDxLine3'
-	if (b == 'ce52df3e11d0d2d00008ccbc0663dc09'): return 'RDxPoint3'
-	if (b == '90874d4711d0d1f80008cabc0663dc09'): return 'RDxBody'
-	if (b == '90874d1111d0d1f80008cabc0663dc09'): return 'RDxPlanarSketch'
-	if (b == 'ce52df3b11d0d2d00008ccbc0663dc09'): return 'RDxArc2'
-	if (b == '74df96e011d1e069800066b1e13554c7'): return 'RDxDiameter2'
-
-	if (b == 'ce52df3511d0d2d00008ccbc0663dc09'): return 'RDxPoint2'
-	if (b == 'ce52df3a11d0d2d00008ccbc0663dc09'): return 'RDxLine2'
-
-	if (b == '1105855811d295e360000cb38932edb0'): return 'RDxDistanceDimension2'
-	if (b == '00acc00011d1e05f800066b1e13554c7'): return 'RDxHorizontalDistance2'
-	if (b == '3683ff4011d1e05f800066b1e13554c7'): return 'RDxVerticalDistance2'
-	if (b == '90874d9111d0d1f80008cabc0663dc09'): return 'RDxFeature'
-	if (b == '2067324411d21dc560002aab01f31bb0'): return 'RDxRectangularPattern'
-	if (b == 'fad9a9b511d2330560002cab01f31bb0'): return 'RDxMirrorPattern'
-	if (b == '6759d86f11d27838600094b70b02ecb0'): return 'FWxRenderingStyle'
-	if (b == 'f645595c11d51333100060a6bba647b5'): return 'MIxTransactablePartition'
-	if (b == 'cc0f752111d18027e38619962259017a'): return 'RSeAcisEntityWrapper'
-	if (b == '26287e9611d490bd1000e2962dba09b5'): return 'RDxDeselTableNode'
-	if (b == '2d86fc2642dfe34030c08ab05ef9bfc5'): return 'RDxReferenceEdgeLoopId'
-	if (b == '8f41fd2411d26eac00082aab32a3dc09'): return 'RDxStopNode'
-	if (b == '2b24130911d272cc60007bb79b49ebb0'): return 'RDxBrowserFolder'
-	if (b == '3c95b7ce11d13388000820a5b17adc09'): return 'NBxNotebook'
-	if (b == 'd81cde4711d265f760005dbead9287b0'): return 'NBxEntry'
-
-	if (b == '671bb70011d1e068800066b1e13554c7'): return 'RDxRadius2'
-	if (b == '590d0a1011d1e6ca80006fb1e13554c7'): return 'RDxAngle2'
-
-	if (b == '1fbb3c0111d2684da0009e9a3c3aa076'): return 'RDxString'
-
-	# logError("\tWARNING - can't find name for type %s" %(b))
-
-	return uid
+	return getUUIDName(uid, uid)
 
 def getText2(uid):
-	b = uid.hex
-
-	if (b == 'ca7163a111d0d3b20008bfbb21eddc09'): return 'UCxComponentNode'
-	if (b == '14533d8211d1087100085ba406e5dc09'): return 'UCxWorkplaneNode'
-	if (b == '2c7020f611d1b3c06000b1b801f31bb0'): return 'UCxWorkaxisNode'
-	if (b == '2c7020f811d1b3c06000b1b801f31bb0'): return 'UCxWorkpointNode'
-	if (b == '9a676a5011d45da66000e3b81269f1b0'): return 'PMxBodyNode'
-	if (b == 'da58aa0e11d43cb1c000ae967a14684f'): return 'SCx3dSketchNode'
-	if (b == '60fd184511d0d79d0008bfbb21eddc09'): return 'SCx2dSketchNode'
-	if (b == 'a94779e011d438066000b1b7b035f1b0'): return 'PMxSingleFeatureOutline'
-	if (b == 'a94779e111d438066000b1b7b035f1b0'): return 'PMxPatternOutline'
-	if (b == '022ac1b511d20d356000f99ac5361ab0'): return 'PMxPartDrawAttr'
-	if (b == 'af48560f11d48dc71000d58dc04a0ab5'): return 'PMxColorStylePrimAttr'
-	if (b == '452121b611d514d6100061a6bba647b5'): return 'RDxModelerTxnMgr'
-	if (b == '90874d4711d0d1f80008cabc0663dc09'): return 'RDxBody'
-	if (b == 'b251bfc011d24761a0001580d694c7c9'): return 'PMxEntryManager'
-	if (b == '21e870bb11d0d2d000d8ccbc0663dc09'): return 'BRxEntry'
-	if (b == 'dbbad87b11d228b0600052bead9287b0'): return 'NBxItem'
-
-	# logError("\tWARNING - can't find name for node %s" %(b))
-
-	return uid
+	return getUUIDName(uid, uid)
 
 # IFF: IF Function
 def IFF(expression, valueTrue, valueFalse):
@@ -530,10 +599,13 @@ def isEmbeddings(names):
 
 	return embedding
 
+# Values closer than this are considered equal (see isEqual).
+TOLERANCE = 0.0001
+
 def isEqual(a, b):
 	if (a is None): return isEqual(b, 0)
 	if (b is None): return isEqual(a, 0)
-	return (fabs(a - b) < 0.0001)
+	return (fabs(a - b) < TOLERANCE)
 
 def logWarning(msg):
 	logMessage(msg, LOG.LOG_WARNING)
@@ -543,16 +615,48 @@ def logError(msg):
 	logMessage(msg, LOG.LOG_ERROR)
 	return
 
+def consoleLogSink(msg, level):
+	'''
+	Writes the message to FreeCAD's report view - if FreeCAD is already loaded.
+	Otherwise warnings and errors are written to stderr and messages to stdout.
+	'''
+	FreeCAD = sys.modules.get('FreeCAD')
+	if (FreeCAD is not None):
+		if (level == LOG.LOG_WARNING):
+			FreeCAD.Console.PrintWarning(msg + '\n')
+		elif (level == LOG.LOG_ERROR):
+			FreeCAD.Console.PrintError(msg + '\n')
+		else:
+			FreeCAD.Console.PrintMessage(msg + '\n')
+	elif ((level == LOG.LOG_WARNING) or (level == LOG.LOG_ERROR)):
+		sys.stderr.write(msg + '\n')
+	else:
+		sys.stdout.write(msg + '\n')
+	return
+
+_logSink = consoleLogSink
+
+def getLogSink():
+	global _logSink
+	return _logSink
+
+def setLogSink(sink):
+	'''
+	Sets the callable(msg, level) that receives all log messages passing LOG.LOG_FILTER.
+	None restores the default consoleLogSink.
+	'''
+	global _logSink
+	if (sink is None):
+		_logSink = consoleLogSink
+	else:
+		_logSink = sink
+	return
+
 def logMessage(msg, level=LOG.LOG_DEBUG):
 	if (level != LOG.LOG_ALWAYS):
 		if ((level & LOG.LOG_FILTER) == 0):
 			return
-	if (level == LOG.LOG_WARNING):
-		FreeCAD.Console.PrintWarning(msg + '\n')
-	elif (level == LOG.LOG_ERROR):
-		FreeCAD.Console.PrintError(msg + '\n')
-	else:
-		FreeCAD.Console.PrintMessage(msg + '\n')
+	_logSink(msg, level)
 
 def getDumpLineLength():
 	global _dumpLineLength
@@ -566,6 +670,15 @@ def getFileVersion():
 	global _fileVersion
 	return _fileVersion
 
+def getBoolPreference(name, default):
+	'''
+	Returns the boolean preference of the InventorLoader - or the default if FreeCAD is not loaded.
+	'''
+	FreeCAD = sys.modules.get('FreeCAD')
+	if (FreeCAD is None):
+		return default
+	return FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/InventorLoader").GetBool(name, default)
+
 def getProperty(ole, path, key):
 	p = ole.getproperties([path], convert_time=True)
 	if (p is not None):
@@ -638,3 +751,8 @@ class Color():
 		b = int(self.blue  * 0xFF)
 		a = int(self.alpha * 0xFF)
 		return u'#%02X%02X%02X%02X' %(a, r, g, b)
+
+# Loaded after the log functions are defined - invalid lines are reported as warnings.
+_uuidNamesFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Resources', 'uuidNames.txt')
+if (os.path.exists(_uuidNamesFile)):
+	loadUUIDNames(_uuidNamesFile)